@@ -0,0 +1,207 @@
+# bench.py
+"""
+Micro-benchmarks for the CPU-bound parts of server.py.
+
+    python bench.py
+
+Needs the same Python packages as the server, but no Tesseract and no
+network access (audio is synthesized with the "stub" TTS backend).
+"""
+import random
+import tempfile
+import time
+
+from indic_transliteration.sanscript import transliterate
+
+import server
+
+# Sign-like text per source scheme, covering conjuncts, nukta, vowel marks,
+# digits, punctuation and embedded Latin. The native engine must reproduce
+# sanscript on every (source, target) pair.
+GOLDEN_CORPUS = {
+    "devanagari": "नई दिल्ली रेलवे स्टेशन। महात्मा गांधी मार्ग, संख्या १२३ ॐ क्षत्रिय ज्ञान श्री ऋषिकेश ऑफ़िस ज़िला",
+    "bengali": "কলকাতা হাওড়া স্টেশন, ৎ ক্ষ রবীন্দ্র সরণি ১২",
+    "gurmukhi": "ਅੰਮ੍ਰਿਤਸਰ ਸਟੇਸ਼ਨ ਖ਼ ੱਕ ਗੁਰੂ ਨਾਨਕ ਮਾਰਗ",
+    "gujarati": "અમદાવાદ રોડ, ગાંધીનગર ૧૨",
+    "oriya": "ଭୁବନେଶ୍ୱର ରାସ୍ତା କଟକ",
+    "tamil": "சென்னை மத்திய ரயில் நிலையம் அண்ணா சாலை ஸ்ரீ க்ஷ",
+    "telugu": "హైదరాబాద్ రోడ్డు, సికింద్రాబాద్",
+    "kannada": "ಬೆಂಗಳೂರು ನಗರ ಕ್ಷ ಮೈಸೂರು ರಸ್ತೆ",
+    "malayalam": "തിരുവനന്തപുരം നഗരം ൽ ൻ കൊച്ചി",
+    "itrans": "mahAtmA gAndhI mArga nagar road kShatriya j~nAna shrI R^iShikesha OM",
+    "iast": "mahātmā gāndhī mārga ṛṣikeśa",
+}
+
+
+def _timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_golden_corpus() -> int:
+    """Compare the native engine with sanscript on every pair; returns the mismatch count."""
+    mismatches = 0
+    for from_scheme, text in GOLDEN_CORPUS.items():
+        for to_scheme in server.SANSCRIPT_MAP.values():
+            if to_scheme == from_scheme:
+                continue
+            expected = transliterate(text, from_scheme, to_scheme)
+            got = server.compiled_transliterator_for(from_scheme, to_scheme)(text)
+            if got != expected:
+                mismatches += 1
+                print(f"  MISMATCH {from_scheme} -> {to_scheme}: {expected!r} != {got!r}")
+    return mismatches
+
+
+def _band_words(lines) -> list:
+    """Word entries for (text, top) lines, as one OCR band would report them."""
+    words = []
+    for line, (text, top) in enumerate(lines):
+        for i, word in enumerate(text.split()):
+            words.append({"text": word, "conf": 90.0, "bbox": [10 + 60 * i, top, 50, 10], "line": line})
+    return words
+
+
+# Two overlapping bands of a 200 px high image (band 0 owns rows 0-99, band 1
+# rows 100-199) and the text each band reads; lines at y=90 sit in the overlap.
+BAND_MERGE_CASES = [
+    ([("Bus Stop 10", 40), ("Bus Stop 11", 90)], [("Bus Stop 11", 10), ("Taxi", 60)],
+     "Bus Stop 10\nBus Stop 11\nTaxi"),
+    ([("Platform 1", 40), ("No Parking", 90)], [("No Parking", 10), ("Platform 12", 60)],
+     "Platform 1\nNo Parking\nPlatform 12"),
+    ([("Gandhi Nagar Road", 40), ("Road", 90)], [("Road", 10), ("Exit", 60)],
+     "Gandhi Nagar Road\nRoad\nExit"),
+]
+
+
+def check_band_merge() -> int:
+    """Merge the overlapping bands of BAND_MERGE_CASES; returns the number of wrong results."""
+    bands = [(0, 120, 0, 100), (80, 200, 100, 200)]
+    mismatches = 0
+    for first, second, expected in BAND_MERGE_CASES:
+        got = server._words_to_text(server._merge_band_words([_band_words(first), _band_words(second)], bands))
+        if got != expected:
+            mismatches += 1
+            print(f"  MISMATCH band merge: {expected!r} != {got!r}")
+    return mismatches
+
+
+def bench_transliteration_engines(copies: int = 200, repeat: int = 5):
+    print(f"Transliteration, long text ({copies} copies of each corpus line):")
+    for from_scheme, to_scheme in (("devanagari", "itrans"), ("tamil", "devanagari"),
+                                   ("itrans", "devanagari"), ("bengali", "kannada")):
+        text = " ".join([GOLDEN_CORPUS[from_scheme]] * copies)
+        scheme_map = server.scheme_map_for(from_scheme, to_scheme)
+        engine = server.compiled_transliterator_for(from_scheme, to_scheme)
+        t_sanscript = _timed(lambda: transliterate(text, scheme_map=scheme_map), repeat)
+        t_native = _timed(lambda: engine(text), repeat)
+        mchars = len(text) / 1e6
+        print(f"  {from_scheme:>10} -> {to_scheme:<10} {len(text):>7} chars  "
+              f"sanscript {mchars / t_sanscript:6.2f} Mchar/s  native {mchars / t_native:6.2f} Mchar/s  "
+              f"x{t_sanscript / t_native:.1f}")
+
+
+def _detect_script_reference(text: str) -> str:
+    """The original nested-loop detect_script, kept as the baseline."""
+    if not text or not text.strip():
+        return "unknown"
+    counts = {s: 0 for s in server.SCRIPT_RANGES}
+    for ch in text:
+        cp = ord(ch)
+        for script, ranges in server.SCRIPT_RANGES.items():
+            for start, end in ranges:
+                if start <= cp <= end:
+                    counts[script] += 1
+                    break
+    best = max(counts.items(), key=lambda x: x[1])
+    return best[0] if best[1] > 0 else "unknown"
+
+
+def _mixed_text(length: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    pool = "".join(GOLDEN_CORPUS.values()) + "\n\t0123456789 €—"
+    return "".join(rng.choice(pool) for _ in range(length))
+
+
+def bench_detect_script(sizes=(10_000, 100_000, 1_000_000), repeat: int = 3) -> int:
+    """Time detect_script against the reference loop; returns the number of differing results."""
+    print("detect_script:")
+    mismatches = 0
+    for size in sizes:
+        text = _mixed_text(size, seed=size)
+        if server.detect_script(text) != _detect_script_reference(text):
+            mismatches += 1
+        t_reference = _timed(lambda: _detect_script_reference(text), repeat)
+        t_table = _timed(lambda: server.detect_script(text), repeat)
+        print(f"  {size:>9} chars  reference {size / t_reference / 1e6:6.2f} Mchar/s  "
+              f"table {size / t_table / 1e6:6.2f} Mchar/s  x{t_reference / t_table:.1f}")
+    for seed in range(200):
+        text = _mixed_text(seed % 40, seed=seed)
+        if server.detect_script(text) != _detect_script_reference(text):
+            mismatches += 1
+    return mismatches
+
+
+def bench_detect_scripts(count: int = 20_000, repeat: int = 3) -> int:
+    """Time the batched detect_scripts against per-string detect_script; returns differing results."""
+    texts = [_mixed_text(5 + i % 300, seed=i) for i in range(count)]
+    texts += ["", "   ", "12 34"]
+    chars = sum(len(t) for t in texts)
+    expected = [server.detect_script(t) for t in texts]
+    mismatches = sum(1 for a, b in zip(server.detect_scripts(texts), expected) if a != b)
+    t_scalar = _timed(lambda: [server.detect_script(t) for t in texts], repeat)
+    t_batch = _timed(lambda: server.detect_scripts(texts), repeat)
+    print(f"detect_scripts, {len(texts)} strings / {chars} chars:")
+    print(f"  scalar {chars / t_scalar / 1e6:6.2f} Mchar/s  batched {chars / t_batch / 1e6:6.2f} Mchar/s  "
+          f"x{t_scalar / t_batch:.1f} (numpy={'yes' if server.np is not None else 'no'})")
+    return mismatches
+
+
+def bench_text_pipeline(count: int = 200) -> int:
+    """
+    /transliterate/text with audio through the stub TTS backend, cold and
+    then warm audio cache; returns the number of audio URLs that changed.
+    """
+    server.AUDIO_FOLDER = tempfile.mkdtemp(prefix="bench_audio_")
+    server.TTS_AUDIO = server.TtsAudioIndex(server.AUDIO_FOLDER)
+    server.TTS_BACKEND_ORDER = ["stub"]
+    texts = [f"{line} {i}" for i, line in enumerate(list(GOLDEN_CORPUS.values()) * (count // len(GOLDEN_CORPUS)))]
+    client = server.app.test_client()
+    body = {"texts": texts, "target_script": "all", "audio": True}
+    print(f"/transliterate/text, {len(texts)} texts into every script with stub audio:")
+    urls = []
+    for label in ("cold", "warm"):
+        start = time.perf_counter()
+        results = client.post("/transliterate/text", json=body).get_json()["results"]
+        elapsed = time.perf_counter() - start
+        urls.append([r["audio_url"] for r in results])
+        print(f"  {label} audio cache  {elapsed * 1000:8.1f} ms  {len(texts) / elapsed:8.0f} texts/s")
+    return sum(1 for a, b in zip(*urls) if a != b or not a)
+
+
+def main():
+    mismatches = check_golden_corpus()
+    print(f"Golden corpus: {mismatches} mismatches")
+    band_mismatches = check_band_merge()
+    print(f"Band merge: {band_mismatches} wrong results")
+    mismatches += band_mismatches
+    bench_transliteration_engines()
+    detect_mismatches = bench_detect_script()
+    print(f"detect_script: {detect_mismatches} results differ from the reference")
+    mismatches += detect_mismatches
+    batch_mismatches = bench_detect_scripts()
+    print(f"detect_scripts: {batch_mismatches} results differ from detect_script")
+    mismatches += batch_mismatches
+    pipeline_mismatches = bench_text_pipeline()
+    print(f"text pipeline: {pipeline_mismatches} audio URLs missing or not reused")
+    mismatches += pipeline_mismatches
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,30 @@
 # server.py
 from flask import Flask, request, jsonify, send_file, Response, abort
 from flask_cors import CORS
-from PIL import Image, UnidentifiedImageError
-import io, os, time, tempfile, uuid, re, traceback
+from PIL import Image, ImageFilter, UnidentifiedImageError
+import io, os, time, tempfile, uuid, re, traceback, queue, threading, hashlib, math, functools, itertools, json, zipfile, mmap, unicodedata, shutil, subprocess
 import pytesseract
-from indic_transliteration.sanscript import transliterate
-from gtts import gTTS
+import requests
+from indic_transliteration.sanscript import transliterate, SchemeMap, SCHEMES
+from indic_transliteration.sanscript.schemes import brahmic as brahmic_schemes, roman as roman_schemes
+from gtts import gTTS, gTTSError
+from gtts.lang import tts_langs as gtts_langs
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
 from pathlib import Path
 from typing import Tuple
+from collections import OrderedDict, Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+try:
+    import tesserocr  # optional: in-process Tesseract API, keeps traineddata resident
+except ImportError:
+    tesserocr = None
+
+try:
+    import numpy as np  # optional: vectorized script detection for large batches
+except ImportError:
+    np = None
 
 app = Flask(__name__)
 CORS(app)
@@ -21,6 +37,117 @@ app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10 MB limit
 # IMPORTANT: set this to your PC's LAN IP reachable from phone (used as fallback)
 SERVER_IP = "192.168.31.242"
 
+# OCR worker pool: number of long-lived workers, and how many language-set
+# handles each worker keeps loaded (only relevant when tesserocr is installed)
+OCR_POOL_SIZE = max(1, min(4, os.cpu_count() or 1))
+# Start the pool and load the default models when the app starts, in the
+# process that serves requests (with the debug reloader: the child process)
+OCR_POOL_WARM_ON_START = True
+OCR_POOL_MAX_LANGSETS = 12  # full set + osd + one narrowed set per script
+
+# OCR result cache: in-memory LRU in front of an on-disk tier (byte budgets)
+OCR_CACHE_FOLDER = "ocr_cache"
+OCR_CACHE_MEMORY_BYTES = 8 * 1024 * 1024
+OCR_CACHE_DISK_BYTES = 256 * 1024 * 1024
+
+# Images are decoded to grayscale and downsampled to at most this many pixels
+# before OCR (JPEGs are draft-decoded, so big photos are never fully decoded)
+OCR_MAX_PIXELS = 4_000_000
+
+# Sign-region detection: OCR only edge-dense areas of the photo. The image is
+# scored on a REGION_GRID-cell grid; if the candidate boxes cover more than
+# REGION_MAX_COVERAGE of the frame the whole image is OCR'd instead.
+REGION_DETECTION = True
+REGION_GRID = 48
+REGION_EDGE_THRESHOLD = 20
+REGION_MAX_COVERAGE = 0.8
+REGION_MAX_COUNT = 8
+
+# Tiled OCR: images (or regions) above OCR_TILE_MIN_PIXELS are cut into up to
+# OCR_POOL_SIZE overlapping horizontal bands that are OCR'd concurrently;
+# OCR_TILE_OVERLAP is the overlap as a fraction of the band height
+OCR_TILE_MIN_PIXELS = 2_000_000
+OCR_TILE_OVERLAP = 0.2
+
+# Two-pass OCR: find the dominant script on a downscaled copy (OSD, or a quick
+# OCR pass if OSD is unavailable), then run full-resolution OCR with only that
+# script's models
+TWO_PASS_OCR = True
+SCRIPT_PASS_MAX_SIDE = 1200
+# The narrowed result is kept only if at least this share of its letters
+# (spaces, digits and punctuation not counted) is in the detected script
+TWO_PASS_MIN_SCRIPT_SHARE = 0.4
+
+# Wall-clock budget for OCR of one upload (seconds), fallbacks included.
+# On expiry Tesseract is stopped and whatever was recognized is returned.
+OCR_TIMEOUT_SECONDS = 20
+
+# OCR output mode: "text" (plain string) or "words" (per-word text, box and
+# confidence; words below OCR_MIN_WORD_CONFIDENCE are dropped before
+# transliteration and TTS). Both can be overridden per request.
+OCR_MODE = "text"
+OCR_MIN_WORD_CONFIDENCE = 60
+
+# Batch endpoint: images processed concurrently per batch, and upload limits
+# (a zip archive is expanded in memory, so its uncompressed size is capped)
+BATCH_WORKERS = 2 * OCR_POOL_SIZE
+BATCH_MAX_FILES = 1000
+BATCH_MAX_ARCHIVE_BYTES = 200 * 1024 * 1024
+# Request body limit of /transliterate/batch, which replaces MAX_CONTENT_LENGTH there
+BATCH_MAX_UPLOAD_BYTES = 256 * 1024 * 1024
+
+# detect_scripts() only vectorizes (NumPy) when a batch has at least this many characters
+DETECT_VECTOR_MIN_CHARS = 20_000
+
+# Transliteration engine: "native" (compiled longest-match tables for the
+# schemes in SANSCRIPT_MAP, same output as sanscript) or "sanscript"
+TRANSLIT_ENGINE = "native"
+
+# Transliteration memo: entries kept per level (whole lines, single tokens);
+# lines longer than TRANSLIT_MEMO_MAX_LINE only go through the token level
+TRANSLIT_MEMO_SIZE = 50_000
+TRANSLIT_MEMO_MAX_LINE = 200
+
+# Place-name gazetteer: sorted "key<TAB>canonical[<TAB>audio file]" lines.
+# Lines and tokens found in it are replaced by their official romanization
+# when transliterating into Latin.
+GAZETTEER_PATH = "gazetteer.tsv"
+
+# Fuzzy OCR-error correction against the gazetteer (per request: correct=1).
+# Tokens of at least FUZZY_MIN_TOKEN_LENGTH characters within
+# FUZZY_MAX_DISTANCE edits (1-2) of a gazetteer key are replaced by that key.
+FUZZY_CORRECTION = False
+FUZZY_MAX_DISTANCE = 1
+FUZZY_MIN_TOKEN_LENGTH = 4
+
+# Extra gTTS arguments; part of the audio cache key, so changing them
+# re-synthesizes instead of serving audio made with the old settings
+TTS_OPTIONS = {"tld": "com", "slow": False}
+
+# TTS backends, tried in order until one succeeds: "gtts" (Google, online),
+# "espeak" (espeak-ng, offline; MP3 if lame is installed, else WAV) and
+# "stub" (silent audio, for benchmarks). TTS_LANG_BACKENDS overrides the
+# order per language code, e.g. {"ta": ["espeak", "gtts"]}.
+TTS_BACKEND_ORDER = ["gtts", "espeak"]
+TTS_LANG_BACKENDS = {}
+ESPEAK_SPEED = 150
+TTS_LOCAL_TIMEOUT_SECONDS = 30
+
+# gTTS chunked fallback: sentence chunks are synthesized up to
+# TTS_CHUNK_WORKERS at a time (shared by all requests), and each chunk is
+# retried on its own up to TTS_CHUNK_RETRIES times
+TTS_CHUNK_WORKERS = 4
+TTS_CHUNK_RETRIES = 2
+
+# Asynchronous audio (async_audio=1 per request, or always with TTS_ASYNC):
+# the response returns at once and audio is synthesized on TTS_WORKERS
+# background threads. /audio waits up to TTS_PENDING_WAIT_SECONDS for a
+# pending file, then answers 202 with Retry-After: TTS_RETRY_AFTER_SECONDS.
+TTS_ASYNC = False
+TTS_WORKERS = 4
+TTS_PENDING_WAIT_SECONDS = 10
+TTS_RETRY_AFTER_SECONDS = 2
+
 # If tesseract not in PATH on Windows, uncomment and set the path:
 # pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
@@ -53,6 +180,20 @@ SANSCRIPT_MAP = {
     "latin": "itrans",
 }
 
+# Precompiled sanscript SchemeMap for every pair of the schemes above (plus
+# iast, used for unknown scripts). sanscript only caches 8 pairs itself.
+def _build_scheme_maps() -> dict:
+    schemes = list(dict.fromkeys(list(SANSCRIPT_MAP.values()) + ["iast"]))
+    return {(a, b): SchemeMap(SCHEMES[a], SCHEMES[b]) for a in schemes for b in schemes if a != b}
+
+SCHEME_MAPS = _build_scheme_maps()
+
+def scheme_map_for(from_scheme: str, to_scheme: str) -> SchemeMap:
+    scheme_map = SCHEME_MAPS.get((from_scheme, to_scheme))
+    if scheme_map is None:
+        scheme_map = SCHEME_MAPS[(from_scheme, to_scheme)] = SchemeMap(SCHEMES[from_scheme], SCHEMES[to_scheme])
+    return scheme_map
+
 # TTS language codes for gTTS
 TTS_LANG_MAP = {
     "devanagari": "hi",
@@ -69,47 +210,808 @@ TTS_LANG_MAP = {
 
 DEFAULT_OCR_LANG = "eng+hin+tam+tel+kan+mal+ben+guj+pan"
 
+# Tesseract traineddata -> script it recognizes (used to narrow OCR to one script)
+TESS_LANG_SCRIPTS = {
+    "eng": "latin",
+    "hin": "devanagari",
+    "mar": "devanagari",
+    "nep": "devanagari",
+    "san": "devanagari",
+    "ben": "bengali",
+    "asm": "bengali",
+    "pan": "gurmukhi",
+    "guj": "gujarati",
+    "ori": "oriya",
+    "tam": "tamil",
+    "tel": "telugu",
+    "kan": "kannada",
+    "mal": "malayalam",
+}
+
+
+# Codepoint -> 1-based index into SCRIPT_NAMES (0 = no script), up to the
+# highest range end. The ranges are disjoint, so one slot per codepoint is enough.
+SCRIPT_NAMES = list(SCRIPT_RANGES)
+
+def _build_script_table() -> bytearray:
+    table = bytearray(max(end for ranges in SCRIPT_RANGES.values() for _, end in ranges) + 1)
+    for idx, ranges in enumerate(SCRIPT_RANGES.values(), 1):
+        for start, end in ranges:
+            table[start:end + 1] = bytes([idx]) * (end - start + 1)
+    return table
+
+SCRIPT_TABLE = _build_script_table()
 
 def detect_script(text: str) -> str:
     if not text or not text.strip():
         return "unknown"
-    counts = {s: 0 for s in SCRIPT_RANGES}
-    for ch in text:
+    # one C-level pass to count characters, then one table lookup per distinct character
+    table = SCRIPT_TABLE
+    size = len(table)
+    counts = [0] * (len(SCRIPT_NAMES) + 1)
+    for ch, n in Counter(text).items():
         cp = ord(ch)
-        for script, ranges in SCRIPT_RANGES.items():
-            for start, end in ranges:
-                if start <= cp <= end:
-                    counts[script] += 1
+        if cp < size:
+            counts[table[cp]] += n
+    # first script in SCRIPT_RANGES order wins a tie
+    best = max(range(1, len(counts)), key=counts.__getitem__)
+    return SCRIPT_NAMES[best - 1] if counts[best] > 0 else "unknown"
+
+def detect_scripts(texts: list) -> list:
+    """
+    detect_script for many strings at once, same results. With NumPy and at
+    least DETECT_VECTOR_MIN_CHARS characters, all strings are decoded into one
+    codepoint array, mapped through SCRIPT_TABLE and histogrammed per string
+    with a single bincount; otherwise the scalar path is used.
+    """
+    total = sum(len(t) for t in texts)
+    if np is None or total < DETECT_VECTOR_MIN_CHARS:
+        return [detect_script(t) for t in texts]
+    nscripts = len(SCRIPT_NAMES) + 1
+    codepoints = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    table = np.frombuffer(bytes(SCRIPT_TABLE), dtype=np.uint8)
+    script_idx = np.where(codepoints < len(table),
+                          table[np.minimum(codepoints, len(table) - 1)], 0).astype(np.int64)
+    owner = np.repeat(np.arange(len(texts), dtype=np.int64), [len(t) for t in texts])
+    counts = np.bincount(owner * nscripts + script_idx, minlength=len(texts) * nscripts)
+    counts = counts.reshape(len(texts), nscripts)[:, 1:]
+    best = counts.argmax(axis=1)  # first maximum, i.e. SCRIPT_RANGES order on ties
+    best_counts = counts[np.arange(len(texts)), best]
+    return [SCRIPT_NAMES[b] if n > 0 and t.strip() else "unknown"
+            for t, b, n in zip(texts, best.tolist(), best_counts.tolist())]
+
+class OcrTimeout(Exception):
+    """OCR ran past its deadline; `partial` holds the result recognized in time."""
+
+    def __init__(self, message: str = "OCR deadline exceeded", partial=""):
+        super().__init__(message)
+        self.partial = partial
+
+
+def _words_from_tesseract_dict(data: dict) -> list:
+    """
+    Word entries from pytesseract.image_to_data output:
+    {"text", "conf", "bbox": [left, top, width, height], "line"} where "line"
+    numbers the text lines of the image in reading order.
+    """
+    words = []
+    lines = {}
+    for i, text in enumerate(data.get("text", [])):
+        text = (text or "").strip()
+        if not text or int(data["level"][i]) != 5:
+            continue
+        line = lines.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), len(lines))
+        words.append({
+            "text": text,
+            "conf": round(float(data["conf"][i]), 1),
+            "bbox": [int(data["left"][i]), int(data["top"][i]), int(data["width"][i]), int(data["height"][i])],
+            "line": line,
+        })
+    return words
+
+def _words_to_text(words: list) -> str:
+    lines = OrderedDict()
+    for w in words:
+        lines.setdefault(w["line"], []).append(w["text"])
+    return "\n".join(" ".join(ws) for ws in lines.values())
+
+def _result_text(result) -> str:
+    """Plain text of an OCR result, whether a string or a word list."""
+    return result if isinstance(result, str) else _words_to_text(result)
+
+def _wait_ocr(fut: Future, deadline: float = None):
+    """Result of an OCR job, giving up (and cancelling it if still queued) at `deadline`."""
+    if deadline is None:
+        return fut.result()
+    try:
+        return fut.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeout:
+        fut.cancel()
+        raise OcrTimeout()
+
+
+class OcrWorkerPool:
+    """
+    Pool of long-lived OCR workers that take images from a shared queue.
+    With tesserocr available every worker keeps one PyTessBaseAPI per language
+    set, so traineddata is loaded once per worker instead of once per upload.
+    Without it the workers run pytesseract, which still bounds concurrency.
+    """
+
+    def __init__(self, size: int, warm_langs=()):
+        self.size = max(1, int(size))
+        self.warm_langs = list(warm_langs)
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self, warm: bool = True):
+        """Spawn the workers once; with warm=True each loads warm_langs before taking jobs."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.size):
+                t = threading.Thread(target=self._worker, args=(warm,),
+                                     name=f"ocr-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        app.logger.info("OCR pool started: %d workers (tesserocr=%s)",
+                        self.size, tesserocr is not None)
+
+    def submit(self, image, lang: str, kind: str = "string", deadline: float = None) -> Future:
+        """
+        Queue an OCR job. kind is "string" (recognized text), "data" (word
+        dicts, see _words_from_tesseract_dict) or "osd" (script name).
+        `deadline` is a time.monotonic() value; the worker skips the job or stops
+        Tesseract once it has passed.
+        """
+        self.start(warm=False)
+        fut = Future()
+        self._jobs.put((fut, image, lang, kind, deadline))
+        return fut
+
+    def image_to_string(self, image, lang: str, deadline: float = None) -> str:
+        return _wait_ocr(self.submit(image, lang, deadline=deadline), deadline)
+
+    def detect_osd_script(self, image, deadline: float = None) -> str:
+        """Tesseract OSD script of the image, lower-cased (e.g. "devanagari")."""
+        return _wait_ocr(self.submit(image, "osd", kind="osd", deadline=deadline), deadline)
+
+    def _get_api(self, apis: OrderedDict, lang: str):
+        api = apis.get(lang)
+        if api is not None:
+            apis.move_to_end(lang)
+            return api
+        if lang == "osd":
+            api = tesserocr.PyTessBaseAPI(lang="osd", psm=tesserocr.PSM.OSD_ONLY)
+        else:
+            api = tesserocr.PyTessBaseAPI(lang=lang)
+        apis[lang] = api
+        while len(apis) > OCR_POOL_MAX_LANGSETS:
+            _, old = apis.popitem(last=False)
+            old.End()
+        return api
+
+    def _ocr(self, apis: OrderedDict, image, lang: str, kind: str = "string", deadline: float = None):
+        remaining = 0
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise OcrTimeout()
+        if tesserocr is None:
+            try:
+                if kind == "osd":
+                    osd = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT,
+                                                   timeout=remaining)
+                    return str(osd.get("script", "")).lower()
+                if kind == "data":
+                    return _words_from_tesseract_dict(pytesseract.image_to_data(
+                        image, lang=lang, output_type=pytesseract.Output.DICT, timeout=remaining))
+                return pytesseract.image_to_string(image, lang=lang, timeout=remaining)
+            except RuntimeError as e:
+                # pytesseract kills the tesseract process and raises this on timeout
+                if "timeout" in str(e).lower():
+                    raise OcrTimeout()
+                raise
+        api = self._get_api(apis, lang)
+        api.SetImage(image)
+        if kind == "osd":
+            osd = api.DetectOrientationScript()
+            if not osd:
+                raise RuntimeError("OSD found no script")
+            return str(osd.get("script_name", "")).lower()
+        if not api.Recognize(timeout=int(remaining * 1000)):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise OcrTimeout()
+            raise RuntimeError("Tesseract recognition failed")
+        if kind == "data":
+            return self._iter_words(api)
+        return api.GetUTF8Text()
+
+    @staticmethod
+    def _iter_words(api) -> list:
+        words = []
+        line = -1
+        level = tesserocr.RIL.WORD
+        for it in tesserocr.iterate_level(api.GetIterator(), level):
+            if it.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            text = (it.GetUTF8Text(level) or "").strip()
+            box = it.BoundingBox(level)
+            if not text or not box:
+                continue
+            x1, y1, x2, y2 = box
+            words.append({"text": text, "conf": round(float(it.Confidence(level)), 1),
+                          "bbox": [x1, y1, x2 - x1, y2 - y1], "line": max(line, 0)})
+        return words
+
+    def _worker(self, warm: bool):
+        apis = OrderedDict()
+        if warm:
+            blank = Image.new("L", (32, 32), 255)
+            for lang in self.warm_langs:
+                try:
+                    self._ocr(apis, blank, lang)
+                except Exception as e:
+                    app.logger.warning("OCR warm-up for %s failed: %s", lang, e)
+        while True:
+            fut, image, lang, kind, deadline = self._jobs.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(self._ocr(apis, image, lang, kind, deadline))
+            except Exception as e:
+                fut.set_exception(e)
+
+
+OCR_POOL = OcrWorkerPool(OCR_POOL_SIZE, warm_langs=[DEFAULT_OCR_LANG])
+
+
+class OcrResultCache:
+    """
+    Content-addressed OCR results, keyed by sha256(ocr_lang + image bytes).
+    Two tiers: an in-memory LRU and a directory of text files that survives
+    restarts. Both are evicted least-recently-used first to stay under their
+    byte budgets.
+    """
+
+    def __init__(self, folder: str, memory_bytes: int, disk_bytes: int):
+        self.folder = folder
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()   # key -> text
+        self._memory_size = 0
+        self._disk = OrderedDict()     # key -> file size, oldest first
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+        self._load_disk_index()
+
+    @staticmethod
+    def make_key(file_bytes: bytes, ocr_lang: str) -> str:
+        h = hashlib.sha256(ocr_lang.encode("utf-8"))
+        h.update(b"\0")
+        h.update(file_bytes)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.txt")
+
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.folder):
+            if not name.endswith(".txt"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+
+    def _remember(self, key: str, text: str):
+        size = len(text.encode("utf-8"))
+        if size > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old.encode("utf-8"))
+        self._memory[key] = text
+        self._memory_size += size
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted.encode("utf-8"))
+
+    def get(self, key: str):
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return text
+            if key in self._disk:
+                try:
+                    with open(self._path(key), "r", encoding="utf-8") as f:
+                        text = f.read()
+                    os.utime(self._path(key))
+                except OSError:
+                    self._disk_size -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._remember(key, text)
+                    self.disk_hits += 1
+                    return text
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str):
+        data = text.encode("utf-8")
+        with self._lock:
+            self._remember(key, text)
+            if key in self._disk or len(data) > self.disk_bytes:
+                return
+            path = self._path(key)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                app.logger.warning("OCR cache write failed: %s", e)
+                return
+            self._disk[key] = len(data)
+            self._disk_size += len(data)
+            while self._disk_size > self.disk_bytes:
+                old_key, old_size = self._disk.popitem(last=False)
+                self._disk_size -= old_size
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size,
+            }
+
+
+OCR_CACHE = OcrResultCache(OCR_CACHE_FOLDER, OCR_CACHE_MEMORY_BYTES, OCR_CACHE_DISK_BYTES)
+
+
+def normalize_image_for_ocr(image):
+    """
+    Grayscale copy of `image` with at most OCR_MAX_PIXELS pixels.
+    JPEGs are draft-decoded (DCT scaling by 1/2, 1/4 or 1/8) so only the
+    remaining factor is resampled.
+    """
+    width, height = image.size
+    pixels_in = width * height
+    scale = 1.0
+    if OCR_MAX_PIXELS and pixels_in > OCR_MAX_PIXELS:
+        scale = (OCR_MAX_PIXELS / pixels_in) ** 0.5
+    target = (max(1, int(width * scale)), max(1, int(height * scale)))
+    if scale < 1.0:
+        image.draft("L", target)  # no-op for non-JPEG formats
+    image = image.convert("L")
+    if image.size[0] * image.size[1] > target[0] * target[1]:
+        image = image.resize(target, Image.LANCZOS)
+    app.logger.info("OCR image %dx%d (%d px) -> %dx%d (%d px)",
+                    width, height, pixels_in, image.size[0], image.size[1],
+                    image.size[0] * image.size[1])
+    return image
+
+def detect_text_regions(image) -> list:
+    """
+    Candidate text boxes (left, top, right, bottom) in reading order, found by
+    edge density: cells of a coarse grid with many edges are grouped into
+    8-connected components and each component becomes one padded box.
+    Returns [] when nothing stands out, meaning "OCR the whole image".
+    """
+    width, height = image.size
+    if width < 2 * REGION_GRID or height < 2 * REGION_GRID:
+        return []
+    if width >= height:
+        grid_w, grid_h = REGION_GRID, max(1, round(REGION_GRID * height / width))
+    else:
+        grid_w, grid_h = max(1, round(REGION_GRID * width / height)), REGION_GRID
+    preview = image.copy()
+    preview.thumbnail((grid_w * 16, grid_h * 16))
+    density = list(preview.filter(ImageFilter.FIND_EDGES).resize((grid_w, grid_h), Image.BOX).getdata())
+    mean = sum(density) / len(density)
+    threshold = max(REGION_EDGE_THRESHOLD, 1.5 * mean)
+    dense = [v >= threshold for v in density]
+
+    boxes = []
+    seen = [False] * len(dense)
+    for start in range(len(dense)):
+        if not dense[start] or seen[start]:
+            continue
+        seen[start] = True
+        stack = [start]
+        x0 = x1 = start % grid_w
+        y0 = y1 = start // grid_w
+        cells = 0
+        while stack:
+            idx = stack.pop()
+            cx, cy = idx % grid_w, idx // grid_w
+            cells += 1
+            x0, x1, y0, y1 = min(x0, cx), max(x1, cx), min(y0, cy), max(y1, cy)
+            for ny in (cy - 1, cy, cy + 1):
+                for nx in (cx - 1, cx, cx + 1):
+                    if 0 <= nx < grid_w and 0 <= ny < grid_h:
+                        n = ny * grid_w + nx
+                        if dense[n] and not seen[n]:
+                            seen[n] = True
+                            stack.append(n)
+        if cells >= 2:
+            boxes.append([max(0, x0 - 1), max(0, y0 - 1), min(grid_w, x1 + 2), min(grid_h, y1 + 2), cells])
+
+    # padding can make neighbouring components overlap; merge those
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]), a[4] + b[4]]
+                    del boxes[j]
+                    merged = True
                     break
-    best = max(counts.items(), key=lambda x: x[1])
-    return best[0] if best[1] > 0 else "unknown"
+            if merged:
+                break
 
-def perform_ocr_from_bytes(file_bytes: bytes, ocr_lang: str = None) -> str:
-    ocr_lang = ocr_lang or DEFAULT_OCR_LANG
+    boxes = sorted(boxes, key=lambda b: b[4], reverse=True)[:REGION_MAX_COUNT]
+    covered = sum((b[2] - b[0]) * (b[3] - b[1]) for b in boxes)
+    if not boxes or covered > REGION_MAX_COVERAGE * grid_w * grid_h:
+        return []
+    sx, sy = width / grid_w, height / grid_h
+    regions = [(int(b[0] * sx), int(b[1] * sy), min(width, int(b[2] * sx)), min(height, int(b[3] * sy)))
+               for b in boxes]
+    return sorted(regions, key=lambda r: (r[1], r[0]))
+
+def _band_boxes(width: int, height: int) -> list:
+    """
+    (top, bottom, core_top, core_bottom) of overlapping full-width bands, top to
+    bottom; a single band when the image is small. The core is the band
+    without its overlap, i.e. the rows that band is responsible for.
+    """
+    count = min(OCR_POOL.size, math.ceil(width * height / OCR_TILE_MIN_PIXELS))
+    if count < 2:
+        return [(0, height, 0, height)]
+    band = math.ceil(height / count)
+    overlap = int(band * OCR_TILE_OVERLAP)
+    return [(max(0, i * band - overlap), min(height, (i + 1) * band + overlap),
+             i * band, min(height, (i + 1) * band)) for i in range(count)]
+
+def _combine_words(pieces: list) -> list:
+    """
+    Concatenate word lists of crops given as (words, dx, dy): boxes are shifted
+    to full-image coordinates and line numbers are kept distinct per crop.
+    """
+    combined = []
+    base = 0
+    for words, dx, dy in pieces:
+        for w in words:
+            x, y, bw, bh = w["bbox"]
+            combined.append(dict(w, bbox=[x + dx, y + dy, bw, bh], line=w["line"] + base))
+        if words:
+            base += max(w["line"] for w in words) + 1
+    return combined
+
+def _merge_band_words(parts: list, bands: list) -> list:
+    """Each band keeps only the words centred in its core rows, so overlap words appear once."""
+    pieces = []
+    for words, (top, _, core_top, core_bottom) in zip(parts, bands):
+        kept = [w for w in words if core_top <= top + w["bbox"][1] + w["bbox"][3] / 2 < core_bottom]
+        pieces.append((kept, 0, top))
+    return _combine_words(pieces)
+
+def _ocr_many(images: list, lang: str, deadline: float = None, kind: str = "string") -> list:
+    """
+    OCR several images at once on the pool; large ones are split into bands first.
+    Returns one result per image (text, or a word list for kind="data"). If the
+    deadline passes, raises OcrTimeout whose `partial` is that list with the
+    pieces that finished.
+    """
+    jobs = []
+    for img in images:
+        bands = _band_boxes(*img.size)
+        if len(bands) == 1:
+            jobs.append((bands, [OCR_POOL.submit(img, lang, kind=kind, deadline=deadline)]))
+            continue
+        # bands are always read as words: overlap is removed by position, not by comparing text
+        crops = [img.crop((0, top, img.size[0], bottom)) for top, bottom, _, _ in bands]
+        jobs.append((bands, [OCR_POOL.submit(c, lang, kind="data", deadline=deadline) for c in crops]))
+    results = []
+    timed_out = False
+    for bands, futures in jobs:
+        parts = []
+        for f in futures:
+            try:
+                parts.append(_wait_ocr(f, deadline))
+            except OcrTimeout:
+                timed_out = True
+                parts.append([] if kind == "data" or len(bands) > 1 else "")
+        if len(bands) == 1:
+            results.append(parts[0] if kind == "data" else (parts[0] or "").strip())
+        elif kind == "data":
+            results.append(_merge_band_words(parts, bands))
+        else:
+            results.append(_words_to_text(_merge_band_words(parts, bands)))
+    if timed_out:
+        raise OcrTimeout(partial=results)
+    return results
+
+def _stack_regions(image, regions: list, gap: int = 16):
+    """
+    Paste the region crops of `image` one below the other on a white canvas.
+    Returns the canvas and the top offset of each crop on it.
+    """
+    width = max(r[2] - r[0] for r in regions)
+    tops = []
+    height = 0
+    for left, top, right, bottom in regions:
+        tops.append(height)
+        height += bottom - top + gap
+    canvas = Image.new(image.mode, (width, max(1, height - gap)), 255)
+    for box, top in zip(regions, tops):
+        canvas.paste(image.crop(box), (0, top))
+    return canvas, tops
+
+def _unstack_words(words: list, regions: list, tops: list) -> list:
+    """Move word boxes from a _stack_regions canvas back to full-image coordinates."""
+    moved = []
+    for w in words:
+        x, y, bw, bh = w["bbox"]
+        centre = y + bh / 2
+        i = max(0, sum(1 for t in tops if t <= centre) - 1)
+        moved.append(dict(w, bbox=[x + regions[i][0], y - tops[i] + regions[i][1], bw, bh]))
+    return moved
+
+def _ocr_image(image, lang: str, regions=(), deadline: float = None, kind: str = "string"):
+    """
+    OCR the given regions of `image` (or the whole image if there are none).
+    With tesserocr the regions are OCR'd concurrently; without it every job is
+    a tesseract process that reloads its models, so the regions are stacked on
+    one canvas and OCR'd in a single call. Word boxes are reported in
+    full-image coordinates.
+    """
+    if regions and tesserocr is None and len(regions) > 1:
+        canvas, tops = _stack_regions(image, regions)
+        crops = [canvas]
+
+        def combine(results):
+            return _unstack_words(results[0], regions, tops) if kind == "data" else results[0]
+    else:
+        crops = [image.crop(box) for box in regions]
+
+        def combine(results):
+            if kind == "data":
+                return _combine_words([(r, box[0], box[1]) for r, box in zip(results, regions)])
+            return "\n".join(t for t in results if t)
+
+    if regions:
+        try:
+            result = combine(_ocr_many(crops, lang, deadline, kind))
+        except OcrTimeout as e:
+            raise OcrTimeout(partial=combine(e.partial))
+        if result:
+            return result
+        app.logger.info("No text in %d detected regions; OCR on whole image", len(regions))
+    try:
+        return _ocr_many([image], lang, deadline, kind)[0]
+    except OcrTimeout as e:
+        raise OcrTimeout(partial=e.partial[0])
+
+@functools.lru_cache(maxsize=None)
+def installed_ocr_langs() -> frozenset:
+    """
+    Tesseract languages installed on this machine, probed once and cached.
+    Returns None when the probe fails (languages are then passed through as-is).
+    """
     try:
-        image = Image.open(io.BytesIO(file_bytes)).convert("RGB")
+        if tesserocr is not None:
+            langs = tesserocr.get_languages()[1]
+        else:
+            langs = pytesseract.get_languages(config="")
+    except Exception as e:
+        app.logger.warning("Could not list installed Tesseract languages: %s", e)
+        return None
+    app.logger.info("Installed Tesseract languages: %s", "+".join(sorted(langs)))
+    return frozenset(langs)
+
+def resolve_ocr_lang(ocr_lang: str) -> Tuple[str, list]:
+    """
+    Intersect a "+"-joined language set with the installed traineddata.
+    Returns (usable lang string, dropped languages). Falls back to eng if none
+    of the requested languages is installed.
+    """
+    requested = list(dict.fromkeys(l for l in ocr_lang.split("+") if l))
+    installed = installed_ocr_langs()
+    if installed is None:
+        return "+".join(requested), []
+    kept = [l for l in requested if l in installed]
+    dropped = [l for l in requested if l not in installed]
+    if not kept:
+        kept = ["eng"]
+    return "+".join(kept), dropped
+
+def _indic_models(ocr_lang: str) -> list:
+    return [l for l in ocr_lang.split("+") if TESS_LANG_SCRIPTS.get(l, "latin") != "latin"]
+
+def _narrow_ocr_lang(ocr_lang: str, script: str) -> str:
+    """
+    Keep eng plus the models for an Indic `script`; '' if the language set has
+    none of them. Latin is never narrowed to eng alone, since the Indic text of
+    an English-dominant bilingual sign would then be read as Latin.
+    """
+    if script == "latin":
+        return ""
+    langs = ocr_lang.split("+")
+    keep = [l for l in langs if TESS_LANG_SCRIPTS.get(l) == script]
+    if not keep:
+        return ""
+    return "+".join([l for l in langs if TESS_LANG_SCRIPTS.get(l) == "latin"] + keep)
+
+def _detect_dominant_script(image, ocr_lang: str, regions=(), deadline: float = None, kind: str = "string"):
+    """
+    Cheap first pass on a downscaled copy: Tesseract OSD if it can decide,
+    otherwise a quick OCR with the full language set fed to detect_script.
+    Returns (script, full_result). If the image is too small to be downscaled
+    the fallback pass would be as expensive as the real one, so the full-set
+    OCR is done right away and returned as full_result (script "unknown").
+    """
+    preview = image.copy()
+    preview.thumbnail((SCRIPT_PASS_MAX_SIDE, SCRIPT_PASS_MAX_SIDE))
+    installed = installed_ocr_langs()
+    if installed is None or "osd" in installed:
+        try:
+            script = OCR_POOL.detect_osd_script(preview, deadline)
+            if script in SCRIPT_RANGES:
+                return script, None
+        except OcrTimeout:
+            raise
+        except Exception as e:
+            app.logger.info("OSD script detection unavailable: %s", e)
+    if preview.size == image.size:
+        return "unknown", _ocr_image(image, ocr_lang, regions, deadline, kind)
+    try:
+        return detect_script(OCR_POOL.image_to_string(preview, ocr_lang, deadline)), None
+    except Exception as e:
+        app.logger.warning("Script pre-pass failed: %s", e)
+        return "unknown", None
+
+def _script_letter_share(text: str, script: str) -> float:
+    """Share of the letters (and vowel signs) of `text` that belong to `script`; 0.0 without letters."""
+    idx = SCRIPT_NAMES.index(script) + 1
+    table = SCRIPT_TABLE
+    letters = in_script = 0
+    for ch, n in Counter(text).items():
+        if unicodedata.category(ch)[0] not in "LM":
+            continue
+        letters += n
+        cp = ord(ch)
+        if cp < len(table) and table[cp] == idx:
+            in_script += n
+    return in_script / letters if letters else 0.0
+
+def _ocr_two_pass(image, ocr_lang: str, regions=(), deadline: float = None, kind: str = "string"):
+    """
+    OCR with only eng + the dominant Indic script's model. The narrowed result
+    is kept only if at least TWO_PASS_MIN_SCRIPT_SHARE of its letters are in
+    that script, i.e. the Indic model actually read something and eng did not
+    take over; otherwise (or if the first pass could not decide, or found
+    Latin) the full language set is used instead. A wrong Indic guess that
+    still yields letters of the guessed script is not caught.
+    """
+    if TWO_PASS_OCR and len(_indic_models(ocr_lang)) > 1:
+        script, full_result = _detect_dominant_script(image, ocr_lang, regions, deadline, kind)
+        if full_result is not None:
+            return full_result
+        narrow = _narrow_ocr_lang(ocr_lang, script) if script != "unknown" else ""
+        if narrow:
+            result = _ocr_image(image, narrow, regions, deadline, kind)
+            if _script_letter_share(_result_text(result), script) >= TWO_PASS_MIN_SCRIPT_SHARE:
+                app.logger.info("Two-pass OCR: script=%s lang=%s", script, narrow)
+                return result
+            app.logger.info("Two-pass OCR cross-check failed for %s; using %s", script, ocr_lang)
+    return _ocr_image(image, ocr_lang, regions, deadline, kind)
+
+def perform_ocr_with_details(file_bytes: bytes, ocr_lang: str = None, timeout: float = None,
+                             mode: str = None, min_confidence: float = None) -> dict:
+    """
+    OCR an uploaded image within `timeout` seconds (OCR_TIMEOUT_SECONDS by
+    default). The deadline covers decoding, every OCR pass and the eng
+    fallback. Languages that are not installed are dropped up front.
+    Returns {"text": str, "timed_out": bool, "dropped_langs": list}; on
+    timeout "text" holds whatever was recognized in time.
+    With mode="words" the result also has "words" (text, bbox, conf per word)
+    and "low_confidence_words"; words under `min_confidence` are left out of
+    both "words" and "text".
+    """
+    ocr_lang, dropped = resolve_ocr_lang(ocr_lang or DEFAULT_OCR_LANG)
+    if dropped:
+        app.logger.info("OCR languages not installed, skipped: %s", "+".join(dropped))
+    timeout = OCR_TIMEOUT_SECONDS if timeout is None else timeout
+    deadline = time.monotonic() + timeout if timeout else None
+    words_mode = (mode or OCR_MODE) == "words"
+    kind = "data" if words_mode else "string"
+    min_confidence = OCR_MIN_WORD_CONFIDENCE if min_confidence is None else min_confidence
+    details = {"text": "", "timed_out": False, "dropped_langs": dropped}
+
+    def finish(result, timed_out=False):
+        if words_mode:
+            kept = [w for w in result if w["conf"] >= min_confidence]
+            details.update(words=kept, low_confidence_words=len(result) - len(kept))
+            result = _words_to_text(kept)
+        details.update(text=(result or "").strip(), timed_out=timed_out)
+        return details
+
+    cache_key = OCR_CACHE.make_key(file_bytes, ocr_lang + ("|words" if words_mode else ""))
+    cached = OCR_CACHE.get(cache_key)
+    if cached is not None:
+        return finish(json.loads(cached) if words_mode else cached)
+
+    try:
+        image = normalize_image_for_ocr(Image.open(io.BytesIO(file_bytes)))
     except UnidentifiedImageError:
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
         try:
             tmp.write(file_bytes)
             tmp.close()
-            image = Image.open(tmp.name).convert("RGB")
+            image = normalize_image_for_ocr(Image.open(tmp.name))
         finally:
             try:
                 os.remove(tmp.name)
             except Exception:
                 pass
 
+    regions = detect_text_regions(image) if REGION_DETECTION else []
+    if regions:
+        app.logger.info("OCR regions: %s", regions)
+    empty = [] if words_mode else ""
     try:
-        text = pytesseract.image_to_string(image, lang=ocr_lang)
+        result = _ocr_two_pass(image, ocr_lang, regions, deadline, kind)
+    except OcrTimeout as e:
+        app.logger.warning("OCR timed out after %.1fs (partial len=%d)", timeout, len(e.partial))
+        return finish(e.partial, timed_out=True)
     except Exception as e:
+        if ocr_lang == "eng":
+            app.logger.exception("OCR failed: %s", e)
+            return finish(empty)
         app.logger.warning("OCR multi-lang failed: %s", e)
         try:
-            text = pytesseract.image_to_string(image, lang="eng")
+            result = _ocr_image(image, "eng", regions, deadline, kind)
+        except OcrTimeout as e2:
+            app.logger.warning("Fallback OCR timed out (partial len=%d)", len(e2.partial))
+            return finish(e2.partial, timed_out=True)
         except Exception as e2:
             app.logger.exception("Fallback OCR failed: %s", e2)
-            text = ""
-    return (text or "").strip()
+            return finish(empty)
+    if words_mode:
+        OCR_CACHE.put(cache_key, json.dumps(result, ensure_ascii=False))
+    else:
+        result = (result or "").strip()
+        OCR_CACHE.put(cache_key, result)
+    return finish(result)
+
+def perform_ocr_from_bytes(file_bytes: bytes, ocr_lang: str = None) -> str:
+    return perform_ocr_with_details(file_bytes, ocr_lang=ocr_lang)["text"]
 
 def schwa_delete_for_devanagari_to_latin(transliterated_text: str) -> str:
     if not transliterated_text:
@@ -118,110 +1020,526 @@ def schwa_delete_for_devanagari_to_latin(transliterated_text: str) -> str:
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
+def _split_tts_chunks(text: str) -> list:
+    """Sentence-sized pieces of `text` for chunked synthesis, in order."""
+    pieces = re.split(r'(?<=[\.\?\!।])\s+', text)
+    if len(pieces) == 0:
+        pieces = [text]
+
+    if len(pieces) > 12:
+        joined = []
+        tmp = ""
+        for p in pieces:
+            if len(tmp) + len(p) > 300:
+                joined.append(tmp)
+                tmp = p
+            else:
+                tmp = (tmp + " " + p).strip()
+        if tmp:
+            joined.append(tmp)
+        pieces = joined
+    return [p.strip() for p in pieces if p.strip()]
+
+TTS_CHUNK_EXECUTOR = ThreadPoolExecutor(max_workers=TTS_CHUNK_WORKERS, thread_name_prefix="tts-chunk")
+
+def _gtts_chunk_bytes(piece: str, lang: str) -> bytes:
+    """
+    MP3 bytes of one chunk. Network errors are retried up to TTS_CHUNK_RETRIES
+    times; anything else (e.g. ValueError for an unsupported language) is
+    raised at once.
+    """
+    for attempt in range(TTS_CHUNK_RETRIES + 1):
+        try:
+            buf = io.BytesIO()
+            gTTS(text=piece, lang=lang, **TTS_OPTIONS).write_to_fp(buf)
+            return buf.getvalue()
+        except (gTTSError, requests.RequestException) as e:
+            if attempt == TTS_CHUNK_RETRIES:
+                raise
+            app.logger.warning("gTTS chunk failed (attempt %d): %s", attempt + 1, e)
+            time.sleep(0.5 * (attempt + 1))
+
 def _safe_tts_save_chunks(text: str, lang: str, out_path: str) -> bool:
     """
     For very long text gTTS or the network call could fail.
-    Split into smaller sentences/chunks and append them to produce a single mp3 file.
+    Split into smaller sentences/chunks, synthesize them concurrently in
+    memory and write them, in order, as a single mp3 file.
     Returns True on success.
     """
     try:
-        
-        pieces = re.split(r'(?<=[\.\?\!।])\s+', text)
-       
-        if len(pieces) == 0:
-            pieces = [text]
-        
-        if len(pieces) > 12:
-            joined = []
-            tmp = ""
-            for p in pieces:
-                if len(tmp) + len(p) > 300:
-                    joined.append(tmp)
-                    tmp = p
-                else:
-                    tmp = (tmp + " " + p).strip()
-            if tmp:
-                joined.append(tmp)
-            pieces = joined
+        futures = [TTS_CHUNK_EXECUTOR.submit(_gtts_chunk_bytes, piece, lang) for piece in _split_tts_chunks(text)]
+        if not futures:
+            return False
+        try:
+            chunks = [f.result() for f in futures]
+        except Exception as e:
+            app.logger.exception("gTTS chunk save failed: %s", e)
+            for f in futures:
+                f.cancel()
+            return False
 
-        
-        temp_files = []
-        for i, piece in enumerate(pieces):
-            piece = piece.strip()
-            if not piece:
-                continue
-            tmp_name = f"{out_path}.{i}.mp3"
-            try:
-                tts = gTTS(text=piece, lang=lang)
-                tts.save(tmp_name)
-                temp_files.append(tmp_name)
-            except Exception as e:
-                app.logger.exception("gTTS chunk save failed: %s", e)
-                # cleanup partial files
-                for tf in temp_files:
-                    try:
-                        os.remove(tf)
-                    except Exception:
-                        pass
-                return False
-
-        # Merge temp mp3 files into one by concatenation (works with gTTS-generated mp3s for many players)
+        # Merge by concatenation (works with gTTS-generated mp3s for many players)
         with open(out_path, "wb") as wfd:
-            for tf in temp_files:
-                with open(tf, "rb") as fd:
-                    wfd.write(fd.read())
-        # remove temp files
-        for tf in temp_files:
-            try:
-                os.remove(tf)
-            except Exception:
-                pass
+            for chunk in chunks:
+                wfd.write(chunk)
         return True
     except Exception as e:
         app.logger.exception("Error in _safe_tts_save_chunks: %s", e)
         return False
 
-def generate_tts_audio(text: str, lang_code: str) -> str:
+class TtsBackend:
     """
-    Generate TTS mp3 and return filename (or '' on error).
-    Uses chunk-saving fallback to be robust.
+    A speech synthesizer. save() writes the audio of `text` to out_path and
+    returns True on success; `options` are the settings that change its
+    output, so they are part of the audio cache key.
     """
-    try:
-        os.makedirs(AUDIO_FOLDER, exist_ok=True)
-        filename = f"tts_{uuid.uuid4().hex}.mp3"
-        out_path = os.path.join(AUDIO_FOLDER, filename)
-        
+    name = ""
+    ext = "mp3"
+    mimetype = "audio/mpeg"
+    # whether synthesize_chunk() exists and its outputs can simply be
+    # concatenated, which /audio/stream relies on
+    streamable = False
+
+    @property
+    def options(self) -> dict:
+        return {}
+
+    def available(self) -> bool:
+        return True
+
+    def supports(self, lang_code: str) -> bool:
+        return True
+
+    def save(self, text: str, lang_code: str, out_path: str) -> bool:
+        raise NotImplementedError
+
+    def synthesize_chunk(self, text: str, lang_code: str) -> bytes:
+        raise NotImplementedError
+
+class GttsBackend(TtsBackend):
+    name = "gtts"
+    streamable = True
+
+    @property
+    def options(self) -> dict:
+        return TTS_OPTIONS
+
+    @functools.cached_property
+    def languages(self) -> frozenset:
+        """Language codes gTTS can speak, read once (None if gTTS cannot list them)."""
         try:
-            tts = gTTS(text=text, lang=lang_code)
+            return frozenset(gtts_langs())
+        except Exception as e:
+            app.logger.warning("Could not list gTTS languages: %s", e)
+            return None
+
+    def supports(self, lang_code: str) -> bool:
+        return self.languages is None or lang_code in self.languages
+
+    def save(self, text: str, lang_code: str, out_path: str) -> bool:
+        try:
+            tts = gTTS(text=text, lang=lang_code, **TTS_OPTIONS)
             tts.save(out_path)
             if os.path.exists(out_path):
-                return filename
+                return True
         except Exception as e:
             app.logger.warning("gTTS single-save failed: %s. Trying chunked fallback.", e)
         # fallback: chunked approach
-        ok = _safe_tts_save_chunks(text, lang_code, out_path)
-        if ok and os.path.exists(out_path):
+        return _safe_tts_save_chunks(text, lang_code, out_path)
+
+    def synthesize_chunk(self, text: str, lang_code: str) -> bytes:
+        return _gtts_chunk_bytes(text, lang_code)
+
+class EspeakBackend(TtsBackend):
+    """Offline synthesis with espeak-ng; encoded to MP3 when lame is installed, otherwise WAV."""
+    name = "espeak"
+    VOICES = {"hi": "hi", "mr": "mr", "ne": "ne", "bn": "bn", "as": "as", "pa": "pa", "gu": "gu",
+              "or": "or", "ta": "ta", "te": "te", "kn": "kn", "ml": "ml", "en": "en"}
+
+    def __init__(self):
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.lame = shutil.which("lame")
+        self.ext = "mp3" if self.lame else "wav"
+        self.mimetype = "audio/mpeg" if self.lame else "audio/wav"
+
+    @property
+    def options(self) -> dict:
+        return {"speed": ESPEAK_SPEED, "ext": self.ext}
+
+    def available(self) -> bool:
+        return self.binary is not None
+
+    def supports(self, lang_code: str) -> bool:
+        return lang_code in self.VOICES
+
+    def save(self, text: str, lang_code: str, out_path: str) -> bool:
+        # text goes through stdin (-b 1: UTF-8), so it is never parsed as options
+        data = subprocess.run([self.binary, "-v", self.VOICES[lang_code], "-s", str(ESPEAK_SPEED),
+                               "-b", "1", "--stdout"], input=text.encode("utf-8"), capture_output=True,
+                              check=True, timeout=TTS_LOCAL_TIMEOUT_SECONDS).stdout
+        if self.lame and data:
+            data = subprocess.run([self.lame, "--quiet", "-", "-"], input=data, capture_output=True,
+                                  check=True, timeout=TTS_LOCAL_TIMEOUT_SECONDS).stdout
+        if not data:
+            return False
+        with open(out_path, "wb") as f:
+            f.write(data)
+        return True
+
+class StubTtsBackend(TtsBackend):
+    """
+    Deterministic, offline stand-in: silent MP3 whose length follows the
+    text, for benchmarking the pipeline without network access.
+    """
+    name = "stub"
+    streamable = True
+    # MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, mono; all-zero side info decodes
+    # to 1152 samples of silence
+    FRAME = b"\xff\xfb\x90\xc0" + bytes(413)
+    SECONDS_PER_CHAR = 0.06
+
+    def save(self, text: str, lang_code: str, out_path: str) -> bool:
+        with open(out_path, "wb") as f:
+            f.write(self.synthesize_chunk(text, lang_code))
+        return True
+
+    def synthesize_chunk(self, text: str, lang_code: str) -> bytes:
+        return self.FRAME * max(1, round(len(text) * self.SECONDS_PER_CHAR * 44100 / 1152))
+
+TTS_BACKENDS = {b.name: b for b in (GttsBackend(), EspeakBackend(), StubTtsBackend())}
+
+def tts_backends_for(lang_code: str) -> list:
+    """Usable backends for a language, in the configured fallback order."""
+    names = TTS_LANG_BACKENDS.get(lang_code, TTS_BACKEND_ORDER)
+    return [TTS_BACKENDS[n] for n in names
+            if n in TTS_BACKENDS and TTS_BACKENDS[n].available() and TTS_BACKENDS[n].supports(lang_code)]
+
+def audio_mimetype(filename: str) -> str:
+    for backend in TTS_BACKENDS.values():
+        if filename.endswith("." + backend.ext):
+            return backend.mimetype
+    return "audio/mpeg"
+
+class TtsAudioIndex:
+    """
+    Names of the synthesized audio files in `folder`, loaded once at startup
+    and kept up to date by generate_tts_audio, so a cache lookup never has to
+    touch the filesystem. Also holds the aliases of async jobs whose audio
+    came from a fallback backend: "<job id>.alias" files holding the name of
+    the file that was produced, so their audio URLs survive a restart.
+    """
+
+    ALIAS_SUFFIX = ".alias"
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._names = set()
+        self._aliases = {}   # job id -> produced filename
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(folder, exist_ok=True)
+        for name in os.listdir(folder):
+            if not name.startswith("tts_") or name.endswith(".tmp"):
+                continue
+            if name.endswith(self.ALIAS_SUFFIX):
+                try:
+                    with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                        self._aliases[name[:-len(self.ALIAS_SUFFIX)]] = f.read().strip()
+                except OSError as e:
+                    app.logger.warning("TTS alias %s not loaded: %s", name, e)
+            else:
+                self._names.add(name)
+
+    def lookup(self, filenames: list) -> str:
+        """The first of `filenames` that exists, or ''."""
+        with self._lock:
+            for filename in filenames:
+                if filename in self._names:
+                    self.hits += 1
+                    return filename
+            self.misses += 1
+            return ""
+
+    def add(self, filename: str):
+        with self._lock:
+            self._names.add(filename)
+
+    def add_alias(self, job_id: str, filename: str):
+        """Record (in memory and on disk) that the audio of job `job_id` is in `filename`."""
+        path = os.path.join(self.folder, job_id + self.ALIAS_SUFFIX)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(filename)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            app.logger.warning("TTS alias write failed: %s", e)
+        with self._lock:
+            self._aliases[job_id] = filename
+
+    def resolve(self, name: str) -> str:
+        """The audio file for `name`: itself if it exists, else the file its alias points to, else ''."""
+        with self._lock:
+            if name in self._names:
+                return name
+            target = self._aliases.get(name, "")
+            return target if target in self._names else ""
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "files": len(self._names),
+                "aliases": len(self._aliases),
+            }
+
+TTS_AUDIO = TtsAudioIndex(AUDIO_FOLDER)
+
+def normalize_tts_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def tts_filename(text: str, lang_code: str, backend: TtsBackend) -> str:
+    """Content-addressed audio filename for already normalized text, language and backend settings."""
+    key = json.dumps([text, lang_code, backend.name, backend.options], ensure_ascii=False, sort_keys=True)
+    return f"tts_{hashlib.sha256(key.encode('utf-8')).hexdigest()}.{backend.ext}"
+
+def _synthesize_tts(text: str, lang_code: str, backend: TtsBackend, filename: str) -> bool:
+    """
+    Synthesize normalized `text` with `backend` into AUDIO_FOLDER/filename,
+    writing under a temporary name and renaming into place.
+    """
+    out_path = os.path.join(AUDIO_FOLDER, filename)
+    tmp_path = f"{out_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        if backend.save(text, lang_code, tmp_path) and os.path.exists(tmp_path):
+            os.replace(tmp_path, out_path)
+            TTS_AUDIO.add(filename)
+            return True
+    except Exception as e:
+        app.logger.warning("TTS backend %s failed: %s", backend.name, e)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return False
+
+class TtsJob:
+    def __init__(self, candidates: list):
+        self.candidates = candidates  # [(backend, filename), ...] in fallback order
+        self.done = threading.Event()
+        self.filename = ""            # set once a backend succeeded
+
+class TtsJobs:
+    """
+    Audio syntheses in progress. A job is named after the file its first
+    backend would produce, which doubles as the job id; concurrent requests
+    for the same audio share one job. Finished jobs whose audio came from a
+    fallback backend, or that failed, are remembered (up to MAX_FINISHED) so
+    /audio can resolve or report them, until the same audio is requested again;
+    fallback audio is also recorded as an alias in TTS_AUDIO, which persists.
+    """
+
+    MAX_FINISHED = 1024
+
+    def __init__(self, workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self._pending = {}              # job id -> TtsJob
+        self._finished = OrderedDict()  # job id -> produced filename ("" if failed), oldest first
+        self._lock = threading.Lock()
+
+    def _start(self, text: str, lang_code: str):
+        """(filename or job id, job, started): the job producing the audio, or None if it already exists."""
+        candidates = [(b, tts_filename(text, lang_code, b)) for b in tts_backends_for(lang_code)]
+        if not candidates:
+            app.logger.error("No TTS backend available for %s", lang_code)
+            return "", None, False
+        existing = TTS_AUDIO.lookup([filename for _, filename in candidates])
+        if existing:
+            return existing, None, False
+        job_id = candidates[0][1]
+        with self._lock:
+            job = self._pending.get(job_id)
+            if job is not None:
+                return job_id, job, False
+            job = self._pending[job_id] = TtsJob(candidates)
+            self._finished.pop(job_id, None)
+        return job_id, job, True
+
+    def _run(self, job: TtsJob, text: str, lang_code: str):
+        job_id = job.candidates[0][1]
+        try:
+            for backend, filename in job.candidates:
+                if _synthesize_tts(text, lang_code, backend, filename):
+                    job.filename = filename
+                    break
+            else:
+                app.logger.error("TTS generation ultimately failed for text (len=%d)", len(text))
+        finally:
+            with self._lock:
+                self._pending.pop(job_id, None)
+                if job.filename != job_id:
+                    if job.filename:
+                        TTS_AUDIO.add_alias(job_id, job.filename)
+                    self._finished[job_id] = job.filename
+                    while len(self._finished) > self.MAX_FINISHED:
+                        self._finished.popitem(last=False)
+            job.done.set()
+
+    def run(self, text: str, lang_code: str) -> str:
+        """Synthesize in the calling thread (or wait for the same job elsewhere); filename or ''."""
+        text = normalize_tts_text(text)
+        filename, job, started = self._start(text, lang_code)
+        if job is None:
             return filename
-        app.logger.error("TTS generation ultimately failed for text (len=%d)", len(text))
-        return ""
+        if started:
+            self._run(job, text, lang_code)
+        job.done.wait()
+        return job.filename
+
+    def submit(self, text: str, lang_code: str) -> Tuple[str, bool]:
+        """Synthesize in the background; returns (filename or job id, still pending)."""
+        text = normalize_tts_text(text)
+        filename, job, started = self._start(text, lang_code)
+        if started:
+            self._executor.submit(self._run, job, text, lang_code)
+        return filename, job is not None
+
+    def status(self, job_id: str, timeout: float) -> Tuple[str, str]:
+        """
+        ("pending" | "ready" | "failed" | "unknown", filename) for a job id,
+        waiting up to timeout for a pending job. Jobs finished before a restart
+        are resolved through the aliases in TTS_AUDIO. "unknown" means no job,
+        so job_id is taken to be a plain filename.
+        """
+        with self._lock:
+            job = self._pending.get(job_id)
+            if job is None:
+                if job_id not in self._finished:
+                    filename = TTS_AUDIO.resolve(job_id)
+                    return ("ready", filename) if filename else ("unknown", job_id)
+                filename = self._finished[job_id]
+                return ("ready" if filename else "failed"), filename
+        if not job.done.wait(timeout):
+            return "pending", job_id
+        return ("ready" if job.filename else "failed"), job.filename
+
+TTS_JOBS = TtsJobs(TTS_WORKERS)
+
+class TtsStream:
+    """
+    One streamed synthesis: chunks are appended in order as they are
+    synthesized, and any number of readers follow along through read().
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.ok = False
+        self._cond = threading.Condition()
+
+    def append(self, data: bytes):
+        with self._cond:
+            self.chunks.append(data)
+            self._cond.notify_all()
+
+    def finish(self, ok: bool):
+        with self._cond:
+            self.done = True
+            self.ok = ok
+            self._cond.notify_all()
+
+    def read(self):
+        """Yield every chunk, from the first, waiting for the ones not synthesized yet."""
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.chunks) and not self.done:
+                    self._cond.wait()
+                new = self.chunks[i:]
+                done = self.done
+            i += len(new)
+            yield from new
+            if done:
+                return
+
+class TtsStreams:
+    """
+    Streamed syntheses in progress, keyed by the audio filename; readers of
+    the same audio share one stream. A finished stream is written to
+    AUDIO_FOLDER under that filename, like generate_tts_audio would.
+    """
+
+    def __init__(self, workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-stream")
+        self._active = {}   # filename -> TtsStream
+        self._lock = threading.Lock()
+
+    def open(self, text: str, lang_code: str, backend: TtsBackend, filename: str) -> TtsStream:
+        with self._lock:
+            stream = self._active.get(filename)
+            if stream is not None:
+                return stream
+            stream = self._active[filename] = TtsStream()
+        self._executor.submit(self._produce, stream, text, lang_code, backend, filename)
+        return stream
+
+    def _produce(self, stream: TtsStream, text: str, lang_code: str, backend: TtsBackend, filename: str):
+        # chunks are synthesized concurrently but handed to readers in order
+        futures = [TTS_CHUNK_EXECUTOR.submit(backend.synthesize_chunk, piece, lang_code)
+                   for piece in _split_tts_chunks(text)]
+        ok = False
+        try:
+            for f in futures:
+                stream.append(f.result())
+            ok = bool(futures)
+            if ok:
+                out_path = os.path.join(AUDIO_FOLDER, filename)
+                tmp_path = f"{out_path}.{uuid.uuid4().hex}.tmp"
+                with open(tmp_path, "wb") as f:
+                    for chunk in stream.chunks:
+                        f.write(chunk)
+                os.replace(tmp_path, out_path)
+                TTS_AUDIO.add(filename)
+        except Exception as e:
+            app.logger.exception("Streamed TTS (%s) failed: %s", backend.name, e)
+            for f in futures:
+                f.cancel()
+        finally:
+            with self._lock:
+                self._active.pop(filename, None)
+            stream.finish(ok)
+
+TTS_STREAMS = TtsStreams(TTS_WORKERS)
+
+def generate_tts_audio(text: str, lang_code: str) -> str:
+    """
+    Generate TTS audio and return filename (or '' on error), trying each
+    backend for the language in turn. Identical (text, language, backend
+    settings) reuse the file synthesized before.
+    """
+    try:
+        return TTS_JOBS.run(text, lang_code)
     except Exception as e:
         app.logger.exception("TTS error: %s", e)
         return ""
 
 
-def send_file_partial(path: str):
+def send_file_partial(path: str, mimetype: str = "audio/mpeg"):
     """
     Serve file supporting Range requests, returning a Flask Response.
     """
     file_size = os.path.getsize(path)
     range_header = request.headers.get('Range', None)
     if not range_header:
-        return send_file(path, mimetype="audio/mpeg", conditional=True)
+        return send_file(path, mimetype=mimetype, conditional=True)
 
     # parse Range header "bytes=start-end"
     match = re.search(r"bytes=(\d+)-(\d*)", range_header)
     if not match:
-        return send_file(path, mimetype="audio/mpeg", conditional=True)
+        return send_file(path, mimetype=mimetype, conditional=True)
 
     start = int(match.group(1))
     end = match.group(2)
@@ -234,13 +1552,671 @@ def send_file_partial(path: str):
         f.seek(start)
         data = f.read(length)
 
-    rv = Response(data, 206, mimetype="audio/mpeg", direct_passthrough=True)
+    rv = Response(data, 206, mimetype=mimetype, direct_passthrough=True)
     rv.headers.add('Content-Range', f'bytes {start}-{end}/{file_size}')
     rv.headers.add('Accept-Ranges', 'bytes')
     rv.headers.add('Content-Length', str(length))
     return rv
 
 
+def _public_host() -> str:
+    """Host to put in audio URLs: request.host unless the phone could not reach it."""
+    # Prefer request.host if it looks reachable; otherwise fallback to SERVER_IP
+    host = request.host.split(':')[0] if request.host else ""
+    # If host is obvious loopback, fallback
+    if host in ("127.0.0.1", "localhost", ""):
+        return SERVER_IP
+    # Sometimes request.host is "0.0.0.0" which is not reachable — fallback then too
+    if host in ("0.0.0.0",):
+        return SERVER_IP
+    return host
+
+def parse_target_scripts(value) -> list:
+    """
+    Target scripts from a request value: a name, a comma-separated string, a
+    list of either, or "all" (every script in SANSCRIPT_MAP). Defaults to latin.
+    Raises ValueError for names that are not in SANSCRIPT_MAP.
+    """
+    values = value if isinstance(value, (list, tuple)) else [value]
+    targets = []
+    for v in values:
+        for name in str(v or "").split(","):
+            name = name.strip().lower()
+            if name == "all":
+                targets.extend(SANSCRIPT_MAP)
+            elif name:
+                targets.append(name)
+    unknown = [t for t in dict.fromkeys(targets) if t not in SANSCRIPT_MAP]
+    if unknown:
+        raise ValueError(f"Unknown target_script: {', '.join(unknown)} "
+                         f"(expected one or more of {', '.join(SANSCRIPT_MAP)} or all)")
+    return list(dict.fromkeys(targets)) or ["latin"]
+
+class CompiledTransliterator:
+    """
+    Greedy longest-match transliterator for one scheme pair, compiled from its
+    sanscript SchemeMap. All source tokens go into one regex alternation,
+    longest first, so tokenizing is a single C-level scan. Each token's output
+    and consonant flag is a single table lookup. The inherent-vowel and virama
+    handling mirrors sanscript's _brahmic/_roman loops, so the output is
+    identical (see bench.py for the golden-corpus check). Toggle/suspend
+    options are not supported.
+    """
+
+    def __init__(self, scheme_map: SchemeMap):
+        self.scheme_map = scheme_map
+        self.from_roman = scheme_map.from_scheme.is_roman
+        self.to_roman = scheme_map.to_scheme.is_roman
+        nmv = scheme_map.non_marks_viraama
+        consonants = scheme_map.consonants
+        max_len = scheme_map.max_key_length_from_scheme
+        if self.from_roman:
+            keys = [k for k in nmv if k and len(k) <= max_len]
+            vowels, marks = scheme_map.vowels, scheme_map.vowel_marks
+            # token -> (output after a consonant or None, output otherwise, is consonant)
+            self._table = {}
+            for k in keys:
+                after_consonant = None
+                if k in vowels:
+                    after_consonant = marks.get(k, '') or (vowels[k] if self.to_roman else '')
+                self._table[k] = (after_consonant, nmv[k], k in consonants)
+        else:
+            keys = [k for k in nmv if 1 < len(k) <= max_len]
+            # token -> (output, ends a pending inherent 'a', is consonant)
+            self._table = {k: (nmv[k], True, self.to_roman and k in consonants) for k in keys}
+            singles = set(scheme_map.vowel_marks) | set(scheme_map.virama) | {k for k in nmv if len(k) == 1}
+            for c in singles:
+                if c in scheme_map.vowel_marks:
+                    entry = (scheme_map.vowel_marks[c], False)
+                elif c in scheme_map.virama:
+                    entry = (scheme_map.virama[c], False)
+                else:
+                    entry = (nmv.get(c, c), True)
+                self._table[c] = entry + (self.to_roman and c in consonants,)
+        keys.sort(key=len, reverse=True)
+        self._tokens = re.compile("|".join([re.escape(k) for k in keys] + ["(?s:.)"]))
+        self._brahmic_accents = self._roman_accents = None
+        accents = scheme_map.accents
+        if accents and self.to_roman and not self.from_roman:
+            self._brahmic_accents = re.compile("([%s])([%s])" % (
+                "".join(map(re.escape, scheme_map.from_scheme['yogavaahas'])), "".join(map(re.escape, accents.keys()))))
+        if accents and not self.to_roman and self.from_roman:
+            self._roman_accents = re.compile("([%s])([%s])" % (
+                "".join(map(re.escape, accents.values())), "".join(map(re.escape, scheme_map.to_scheme['yogavaahas']))))
+
+    def __call__(self, data: str) -> str:
+        scheme_map = self.scheme_map
+        data = scheme_map.from_scheme.unapply_shortcuts(data_in=data)
+        result = self._roman(data) if self.from_roman else self._brahmic(data)
+        return scheme_map.to_scheme.apply_shortcuts(data_in=result)
+
+    def _brahmic(self, data: str) -> str:
+        name = self.scheme_map.from_scheme.name
+        if name == brahmic_schemes.GURMUKHI:
+            data = brahmic_schemes.GurmukhiScheme.replace_addak(text=data)
+        elif name == brahmic_schemes.BENGALI:
+            data = brahmic_schemes.BengaliScheme.replace_khanda(text=data)
+        elif name == brahmic_schemes.TELUGU:
+            data = brahmic_schemes.TeluguScheme.replace_n(text=data)
+        elif name == brahmic_schemes.KANNADA:
+            data = brahmic_schemes.KannadaScheme.replace_n(text=data)
+        if self._brahmic_accents is not None:
+            data = self._brahmic_accents.sub("\\2\\1", data)
+        table = self._table
+        buf = []
+        append = buf.append
+        had_consonant = False
+        for token in self._tokens.findall(data):
+            entry = table.get(token)
+            if entry is None:
+                if had_consonant:
+                    append('a')
+                append(token)
+                had_consonant = False
+                continue
+            out, ends_vowel, is_consonant = entry
+            if had_consonant and ends_vowel:
+                append('a')
+            append(out)
+            had_consonant = is_consonant
+        if had_consonant:
+            append(next(iter(self.scheme_map.virama.values())))
+            append('a')
+        return ''.join(buf)
+
+    def _roman(self, data: str) -> str:
+        table = self._table
+        virama = self.scheme_map.virama
+        buf = []
+        append = buf.append
+        had_consonant = False
+        for token in self._tokens.findall(data):
+            entry = table.get(token)
+            if entry is None:
+                if had_consonant:
+                    append(virama[''])
+                append(token)
+                had_consonant = False
+                continue
+            after_consonant, out, is_consonant = entry
+            if had_consonant and after_consonant is not None:
+                if after_consonant:
+                    append(after_consonant)
+            else:
+                if had_consonant:
+                    append(virama[''])
+                append(out)
+            had_consonant = is_consonant
+        if had_consonant:
+            append(virama[''])
+        result = ''.join(buf)
+        if self._roman_accents is not None:
+            result = self._roman_accents.sub("\\2\\1", result)
+        if self.scheme_map.from_scheme.name in roman_schemes.CAPITALIZABLE_SCHEME_IDS:
+            result = self.scheme_map.to_scheme.fix_om(result)
+        return result
+
+
+COMPILED_TRANSLITERATORS = {}
+
+def compiled_transliterator_for(from_scheme: str, to_scheme: str) -> CompiledTransliterator:
+    engine = COMPILED_TRANSLITERATORS.get((from_scheme, to_scheme))
+    if engine is None:
+        engine = COMPILED_TRANSLITERATORS[(from_scheme, to_scheme)] = \
+            CompiledTransliterator(scheme_map_for(from_scheme, to_scheme))
+    return engine
+
+def convert_text(text: str, from_scheme: str, to_scheme: str) -> str:
+    """One transliteration pass with the configured engine (TRANSLIT_ENGINE)."""
+    if TRANSLIT_ENGINE == "native":
+        return compiled_transliterator_for(from_scheme, to_scheme)(text)
+    return transliterate(text, scheme_map=scheme_map_for(from_scheme, to_scheme))
+
+
+_WHITESPACE_SPLIT = re.compile(r'(\s+)')
+
+@functools.lru_cache(maxsize=TRANSLIT_MEMO_SIZE)
+def _transliterate_token(from_scheme: str, to_scheme: str, token: str) -> str:
+    return convert_text(token, from_scheme, to_scheme)
+
+@functools.lru_cache(maxsize=TRANSLIT_MEMO_SIZE)
+def _transliterate_line(from_scheme: str, to_scheme: str, line: str) -> str:
+    return _transliterate_tokens(from_scheme, to_scheme, line)
+
+def _transliterate_tokens(from_scheme: str, to_scheme: str, text: str) -> str:
+    # sanscript treats whitespace as a word boundary, so tokens transliterate independently
+    return "".join(part if not part or part.isspace() else _transliterate_token(from_scheme, to_scheme, part)
+                   for part in _WHITESPACE_SPLIT.split(text))
+
+def memo_transliterate(text: str, from_scheme: str, to_scheme: str) -> str:
+    """
+    Same result as transliterate(text, from_scheme, to_scheme), but each line
+    and whitespace-separated token is looked up in a bounded memo first, so
+    only unseen ones reach sanscript.
+    """
+    out = []
+    for line in text.splitlines(keepends=True):
+        body = line.rstrip("\r\n")
+        if len(body) <= TRANSLIT_MEMO_MAX_LINE:
+            out.append(_transliterate_line(from_scheme, to_scheme, body))
+        else:
+            out.append(_transliterate_tokens(from_scheme, to_scheme, body))
+        out.append(line[len(body):])
+    return "".join(out)
+
+def transliteration_memo_stats() -> dict:
+    stats = {}
+    for level, fn in (("lines", _transliterate_line), ("tokens", _transliterate_token)):
+        info = fn.cache_info()
+        lookups = info.hits + info.misses
+        stats[level] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+            "entries": info.currsize,
+        }
+    return stats
+
+class Gazetteer:
+    """
+    Read-only place-name index over a memory-mapped TSV file. Each line is
+    "key<TAB>canonical[<TAB>audio file]"; keys are normalize_key() forms and
+    the lines are sorted by their UTF-8 bytes (LC_ALL=C sort). Lookups
+    binary-search the mapping directly, so nothing is loaded into the heap
+    and worker processes share the pages through the OS page cache.
+    """
+
+    # punctuation around a token that is not part of the place name
+    TOKEN_PUNCTUATION = ".,;:!?()[]{}\"'‘’“”-–—।॥"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mm = None
+        self.lookups = 0
+        self.hits = 0
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            app.logger.warning("Gazetteer %s not loaded: %s", path, e)
+
+    def __bool__(self):
+        return self._mm is not None
+
+    @staticmethod
+    def normalize_key(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+    def _line_at(self, pos: int) -> Tuple[int, int]:
+        mm = self._mm
+        start = mm.rfind(b"\n", 0, pos) + 1
+        end = mm.find(b"\n", start)
+        return start, (end if end >= 0 else len(mm))
+
+    def lookup(self, text: str):
+        """(canonical, audio file or "") for `text`, or None."""
+        if self._mm is None:
+            return None
+        key = self.normalize_key(text).encode("utf-8")
+        if not key:
+            return None
+        self.lookups += 1
+        mm = self._mm
+        lo, hi = 0, len(mm)
+        # lo and hi always sit on line starts
+        while lo < hi:
+            start, end = self._line_at((lo + hi) // 2)
+            tab = mm.find(b"\t", start, end)
+            line_key = mm[start:tab if tab >= 0 else end]
+            if line_key < key:
+                lo = end + 1
+            elif line_key > key:
+                hi = start
+            else:
+                fields = mm[start:end].decode("utf-8").rstrip("\r").split("\t")
+                self.hits += 1
+                return (fields[1] if len(fields) > 1 else fields[0]), (fields[2] if len(fields) > 2 else "")
+        return None
+
+    def keys(self):
+        """Every key, in file order."""
+        if self._mm is None:
+            return
+        mm = self._mm
+        start = 0
+        while start < len(mm):
+            end = mm.find(b"\n", start)
+            end = end if end >= 0 else len(mm)
+            line = mm[start:end]
+            if line.strip():
+                yield line.split(b"\t", 1)[0].decode("utf-8")
+            start = end + 1
+
+    @functools.cached_property
+    def max_key_words(self) -> int:
+        """Word count of the longest key, found with one scan of the file on first use."""
+        return max((k.count(" ") + 1 for k in self.keys()), default=1)
+
+    def audio_for(self, text: str) -> str:
+        """Cached audio file of `text` as a whole entry, if it exists in AUDIO_FOLDER."""
+        entry = self.lookup(text)
+        if entry and entry[1] and os.path.isfile(os.path.join(AUDIO_FOLDER, secure_filename(entry[1]))):
+            return secure_filename(entry[1])
+        return ""
+
+    def substitute(self, text: str, fallback) -> str:
+        """
+        Replace every line of `text` that is a gazetteer entry by its canonical
+        form; otherwise replace the longest runs of consecutive tokens (up to
+        max_key_words) that are entries, falling back to single tokens. The
+        text in between goes through fallback(text) in one piece, with its
+        outer whitespace kept.
+        """
+        out = []
+        for line in text.splitlines(keepends=True):
+            body = line.rstrip("\r\n")
+            entry = self.lookup(body)
+            if entry:
+                out.append(_keep_outer_whitespace(body, lambda core: entry[0]))
+            else:
+                # tokens sit at even indexes, the whitespace between them at odd ones
+                parts = _WHITESPACE_SPLIT.split(body)
+                pending = []
+                i = 0
+                while i < len(parts):
+                    match = self._match_tokens(parts, i)
+                    if not match:
+                        pending.append(parts[i])
+                        i += 1
+                        continue
+                    end, phrase, core, entry = match
+                    start = phrase.index(core)
+                    pending.append(phrase[:start])
+                    out.append(_keep_outer_whitespace("".join(pending), fallback))
+                    out.append(entry[0])
+                    pending = [phrase[start + len(core):]]
+                    i = end
+                out.append(_keep_outer_whitespace("".join(pending), fallback))
+            out.append(line[len(body):])
+        return "".join(out)
+
+    def _match_tokens(self, parts: list, i: int):
+        """
+        (end, phrase, core, entry) for the longest run of tokens parts[i:end]
+        whose text, without outer punctuation, is a gazetteer key; else None.
+        """
+        part = parts[i]
+        if not part or part.isspace():
+            return None
+        for n in range(min(self.max_key_words, (len(parts) - i + 1) // 2), 0, -1):
+            phrase = "".join(parts[i:i + 2 * n - 1])
+            core = phrase.strip(self.TOKEN_PUNCTUATION)
+            # a run must not end on a token that is all punctuation
+            if core and core == core.strip():
+                entry = self.lookup(core)
+                if entry:
+                    return i + 2 * n - 1, phrase, core, entry
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "loaded": self._mm is not None,
+            "bytes": len(self._mm) if self._mm is not None else 0,
+            "lookups": self.lookups,
+            "hits": self.hits,
+        }
+
+GAZETTEER = Gazetteer(GAZETTEER_PATH)
+
+def damerau_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between a and b, or max_distance + 1
+    as soon as it is known to be larger than max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= max_distance else max_distance + 1
+
+class FuzzyIndex:
+    """
+    SymSpell-style deletion index: every string reachable from a key by up to
+    max_distance deletions maps to that key. A query only generates its own
+    deletions and verifies the few candidates they hit, so lookups stay
+    independent of the number of keys.
+    """
+
+    def __init__(self, keys, max_distance: int):
+        self.max_distance = max_distance
+        self._index = {}   # deletion -> [key, ...]
+        self.size = 0
+        for key in keys:
+            self.size += 1
+            for variant in self._deletions(key):
+                self._index.setdefault(variant, []).append(key)
+
+    def _deletions(self, word: str) -> set:
+        found = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+            found |= frontier
+        return found
+
+    def lookup(self, word: str):
+        """(closest key, distance) for `word`, or None; ties go to the smallest key."""
+        best = None
+        for variant in self._deletions(word):
+            for key in self._index.get(variant, ()):
+                d = damerau_levenshtein(word, key, self.max_distance)
+                if d <= self.max_distance and (best is None or (d, key) < best[::-1]):
+                    best = (key, d)
+        return best
+
+@functools.lru_cache(maxsize=None)
+def gazetteer_fuzzy_index() -> FuzzyIndex:
+    """Deletion index over the single-word gazetteer keys, built on first use."""
+    start = time.time()
+    index = FuzzyIndex((k for k in GAZETTEER.keys() if " " not in k), FUZZY_MAX_DISTANCE)
+    app.logger.info("Gazetteer fuzzy index: %d keys in %.2fs", index.size, time.time() - start)
+    return index
+
+def correct_ocr_text(text: str) -> Tuple[str, list]:
+    """
+    Replace tokens of `text` that are a few OCR errors away from a gazetteer
+    key by that key. Returns (corrected text, [{"original", "corrected",
+    "distance"}, ...]).
+    """
+    if not GAZETTEER or not text:
+        return text, []
+    index = gazetteer_fuzzy_index()
+    corrections = []
+    parts = _WHITESPACE_SPLIT.split(text)
+    for i, part in enumerate(parts):
+        core = part.strip(Gazetteer.TOKEN_PUNCTUATION)
+        if len(core) < FUZZY_MIN_TOKEN_LENGTH or part.isspace():
+            continue
+        match = index.lookup(Gazetteer.normalize_key(core))
+        if match and match[1] > 0:
+            parts[i] = part.replace(core, match[0], 1)
+            corrections.append({"original": core, "corrected": match[0], "distance": match[1]})
+    return "".join(parts), corrections
+
+def request_flag(value, default: bool) -> bool:
+    """A boolean request option given as a form string or JSON value; `default` when absent."""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+def _keep_outer_whitespace(text: str, fn) -> str:
+    """fn(text) applied to `text` without its leading and trailing whitespace."""
+    core = text.strip()
+    if not core:
+        return text
+    start = text.index(core)
+    return text[:start] + fn(core) + text[start + len(core):]
+
+def _transliterate_from(text: str, detected_script: str, target_script: str) -> str:
+    # official romanizations of known place names win over transliteration
+    if target_script == "latin" and GAZETTEER:
+        return GAZETTEER.substitute(text, lambda part: _transliterate_plain(part, detected_script, target_script))
+    return _transliterate_plain(text, detected_script, target_script)
+
+def _transliterate_plain(text: str, detected_script: str, target_script: str) -> str:
+    from_scheme = SANSCRIPT_MAP.get(detected_script, "iast")
+    to_scheme = SANSCRIPT_MAP.get(target_script, "itrans")
+    if from_scheme == to_scheme:
+        transliterated = text
+    else:
+        try:
+            transliterated = memo_transliterate(text, from_scheme, to_scheme)
+        except Exception as e:
+            app.logger.exception("Transliteration %s -> %s failed: %s", from_scheme, to_scheme, e)
+            transliterated = text
+
+    # schwa deletion heuristic only for dev->latin (conservative)
+    if detected_script == 'devanagari' and target_script == 'latin':
+        transliterated = schwa_delete_for_devanagari_to_latin(transliterated)
+    return transliterated
+
+# One alternative per script; a match is a maximal run of that script's
+# letters. Only ASCII letters count as latin, so digits, whitespace and
+# punctuation are left between matches as neutral characters.
+_SCRIPT_RUN_PATTERN = re.compile("|".join(
+    f"(?P<{script}>[A-Za-z]+)" if script == "latin" else
+    "(?P<%s>[%s]+)" % (script, "".join(f"\\u{start:04x}-\\u{end:04x}" for start, end in ranges))
+    for script, ranges in SCRIPT_RANGES.items()
+))
+
+def segment_scripts(text: str) -> list:
+    """
+    Split `text` into same-script runs in one regex scan. Returns
+    [(script, run_text), ...] whose texts concatenate back to `text`; neutral
+    characters join the run before them (or the first run when leading).
+    """
+    runs = []
+    pos = 0
+    for m in _SCRIPT_RUN_PATTERN.finditer(text):
+        script = m.lastgroup
+        gap = text[pos:m.start()]
+        if runs and runs[-1][0] == script:
+            runs[-1][1] += gap + m.group()
+        elif runs:
+            runs[-1][1] += gap
+            runs.append([script, m.group()])
+        else:
+            runs.append([script, gap + m.group()])
+        pos = m.end()
+    if runs:
+        runs[-1][1] += text[pos:]
+    elif text:
+        runs.append(["unknown", text])
+    return [(script, run) for script, run in runs]
+
+def _transliterate_run(run: str, script: str, target_script: str) -> str:
+    """Transliterate one run of a mixed-script text; its surrounding whitespace is kept as is."""
+    if script in ("latin", "unknown"):
+        return run
+    return _keep_outer_whitespace(run, lambda core: _transliterate_from(core, script, target_script))
+
+def transliterate_text_targets(text: str, target_scripts: list, detected_script: str = None) -> Tuple[str, dict, list]:
+    """
+    Detect the script of `text` once (unless already known) and transliterate
+    it into every target. Text mixing several scripts is transliterated run by
+    run, each with its own source scheme. Returns (detected_script,
+    {target_script: text}, runs), where runs is empty for single-script text
+    and otherwise lists {"text", "script", "transliterations"} per run.
+    """
+    detected_script = detected_script or detect_script(text)
+    segments = segment_scripts(text)
+    if len({script for script, _ in segments}) < 2:
+        return detected_script, {t: _transliterate_from(text, detected_script, t) for t in target_scripts}, []
+    runs = [{
+        "text": run,
+        "script": script,
+        "transliterations": {t: _transliterate_run(run, script, t) for t in target_scripts},
+    } for script, run in segments]
+    results = {t: "".join(r["transliterations"][t] for r in runs) for t in target_scripts}
+    return detected_script, results, runs
+
+def transliterate_text(text: str, target_script: str) -> Tuple[str, str]:
+    """
+    Detect the script of `text` and transliterate it into target_script.
+    Returns (detected_script, transliterated_text).
+    """
+    detected_script, results, _ = transliterate_text_targets(text, [target_script])
+    return detected_script, results[target_script]
+
+def _tts_request(original: str, transliterated: str, detected_script: str, target_script: str) -> Tuple[str, str]:
+    """(text, gTTS language) to voice for a transliteration result."""
+    # TTS: pick language code
+    tts_lang = TTS_LANG_MAP.get(detected_script, TTS_LANG_MAP.get(target_script, "en"))
+    # prefer original-language text for tts (more natural)
+    return (original if detected_script != 'latin' else transliterated), tts_lang
+
+def _generate_audio(text: str, tts_text: str, tts_lang: str, async_audio: bool) -> Tuple[str, bool]:
+    """
+    (audio filename, still pending) for a result: the gazetteer's cached audio
+    for `text`, else tts_text synthesized now or, with async_audio, in the
+    background.
+    """
+    cached = GAZETTEER.audio_for(text)
+    if cached:
+        return cached, False
+    if async_audio:
+        return TTS_JOBS.submit(tts_text, tts_lang)
+    return generate_tts_audio(tts_text, tts_lang), False
+
+def _audio_url(audio_filename: str, host: str, log: bool = True) -> str:
+    if not audio_filename:
+        return ""
+    audio_url = f"http://{host}:5000/audio/{secure_filename(audio_filename)}"
+    if log:
+        app.logger.info("Audio URL: %s", audio_url)
+    return audio_url
+
+def build_transliteration_response(ocr: dict, target_scripts: list, host: str,
+                                   with_audio: bool = True, log: bool = True, correct: bool = False,
+                                   async_audio: bool = False) -> dict:
+    """
+    Response body of /transliterate for an OCR result (see
+    perform_ocr_with_details): optional gazetteer correction, script
+    detection, transliteration into each of target_scripts and, if
+    with_audio, a TTS audio URL on `host` (synthesized in the background with
+    async_audio). The single-target fields describe the first target;
+    "transliterations" has all of them.
+    """
+    extracted = ocr["text"]
+    target_script = target_scripts[0]
+    if not extracted:
+        response = {
+            "original_text": "",
+            "transliterated_text": "",
+            "transliterations": {t: "" for t in target_scripts},
+            "detected_script": "unknown",
+            "target_script": target_script,
+            "target_scripts": target_scripts,
+            "langCode": "",
+            "audio_url": "",
+            "ocr_timed_out": ocr["timed_out"],
+            "dropped_ocr_langs": ocr["dropped_langs"],
+            "error": "OCR timed out" if ocr["timed_out"] else "No text found in image"
+        }
+        if "words" in ocr:
+            response.update(words=ocr["words"], low_confidence_words=ocr["low_confidence_words"])
+        return response
+
+    text, corrections = correct_ocr_text(extracted) if correct else (extracted, [])
+
+    # detect once & transliterate into every target
+    detected_script, transliterations, runs = transliterate_text_targets(text, target_scripts)
+    transliterated = transliterations[target_script]
+    tts_text_for_generation, tts_lang = _tts_request(text, transliterated, detected_script, target_script)
+
+    audio_filename, audio_pending = "", False
+    if with_audio and tts_text_for_generation.strip():
+        audio_filename, audio_pending = _generate_audio(text, tts_text_for_generation, tts_lang, async_audio)
+    audio_url = _audio_url(audio_filename, host, log)
+
+    response = {
+        "original_text": extracted,
+        "transliterated_text": transliterated,
+        "transliterations": transliterations,
+        "detected_script": detected_script,
+        "target_script": target_script,
+        "target_scripts": target_scripts,
+        "langCode": f"{tts_lang}",
+        "audio_url": audio_url,
+        "ocr_timed_out": ocr["timed_out"],
+        "dropped_ocr_langs": ocr["dropped_langs"],
+        "error": ""
+    }
+    if async_audio:
+        response["audio_pending"] = audio_pending
+    if correct:
+        response.update(corrected_text=text, corrections=corrections)
+    if runs:
+        response["runs"] = runs
+    if "words" in ocr:
+        response.update(words=ocr["words"], low_confidence_words=ocr["low_confidence_words"])
+    return response
+
+
 @app.route('/transliterate', methods=['POST'])
 def transliterate_image():
     try:
@@ -250,84 +2226,197 @@ def transliterate_image():
         if file.filename == '':
             return jsonify({'error': 'Empty filename'}), 400
 
-        target_script = (request.form.get('target_script') or 'latin').lower()
+        try:
+            target_scripts = parse_target_scripts(request.form.getlist('target_script'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         ocr_lang = request.form.get('ocr_lang') or DEFAULT_OCR_LANG
+        ocr_mode = (request.form.get('ocr_mode') or OCR_MODE).lower()
+        min_confidence = request.form.get('min_confidence', type=float)
+        correct = request_flag(request.form.get('correct'), FUZZY_CORRECTION)
+        async_audio = request_flag(request.form.get('async_audio'), TTS_ASYNC)
 
         file_bytes = file.read()
         if not file_bytes:
             return jsonify({'error': 'Empty file'}), 400
 
         start = time.time()
-        extracted = perform_ocr_from_bytes(file_bytes, ocr_lang=ocr_lang)
-        app.logger.info("OCR time: %.2fs len=%d", time.time() - start, len(extracted))
-
-        if not extracted:
-            return jsonify({
-                "original_text": "",
-                "transliterated_text": "",
-                "detected_script": "unknown",
-                "target_script": target_script,
-                "langCode": "",
-                "audio_url": "",
-                "error": "No text found in image"
-            }), 200
-
-        # detect & transliterate
-        detected_script = detect_script(extracted)
-        from_scheme = SANSCRIPT_MAP.get(detected_script, "iast")
-        to_scheme = SANSCRIPT_MAP.get(target_script, "itrans")
+        ocr = perform_ocr_with_details(file_bytes, ocr_lang=ocr_lang, mode=ocr_mode,
+                                       min_confidence=min_confidence)
+        app.logger.info("OCR time: %.2fs len=%d", time.time() - start, len(ocr["text"]))
+
+        return jsonify(build_transliteration_response(ocr, target_scripts, _public_host(), correct=correct,
+                                                      async_audio=async_audio)), 200
+
+    except Exception as e:
+        app.logger.exception("Server exception: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+
+BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="batch")
+
+def _read_batch_files() -> list:
+    """
+    (filename, bytes) for every image of a batch upload, in upload order:
+    repeated `files` parts and/or the members of a zip `archive`.
+    Raises ValueError for a bad archive or a batch over the limits.
+    """
+    items = [(f.filename, f.read()) for f in request.files.getlist('files')]
+    archive = request.files.get('archive')
+    if archive:
         try:
-            if from_scheme == to_scheme:
-                transliterated = extracted
-            else:
-                transliterated = transliterate(extracted, from_scheme, to_scheme)
-        except Exception as e:
-            app.logger.exception("Transliteration error: %s", e)
-            try:
-                intermediate = transliterate(extracted, from_scheme, "iast")
-                transliterated = transliterate(intermediate, "iast", to_scheme)
-            except Exception as e2:
-                app.logger.exception("Fallback transliteration failed: %s", e2)
-                transliterated = extracted
-
-        # schwa deletion heuristic only for dev->latin (conservative)
-        if detected_script == 'devanagari' and target_script == 'latin':
-            transliterated = schwa_delete_for_devanagari_to_latin(transliterated)
-
-        # TTS: pick language code
-        tts_lang = TTS_LANG_MAP.get(detected_script, TTS_LANG_MAP.get(target_script, "en"))
-        # prefer original-language text for tts (more natural)
-        tts_text_for_generation = extracted if detected_script != 'latin' else transliterated
-
-        audio_filename = ""
-        if tts_text_for_generation.strip():
-            audio_filename = generate_tts_audio(tts_text_for_generation, tts_lang)
-
-        audio_url = ""
-        if audio_filename:
-            # Prefer request.host if it looks reachable; otherwise fallback to SERVER_IP
-            host = request.host.split(':')[0] if request.host else ""
-            # If host is obvious loopback, fallback
-            if host in ("127.0.0.1", "localhost", ""):
-                host_to_use = SERVER_IP
-            else:
-                # Sometimes request.host is "0.0.0.0" which is not reachable — fallback then too
-                if host in ("0.0.0.0",):
-                    host_to_use = SERVER_IP
-                else:
-                    host_to_use = host
-            audio_url = f"http://{host_to_use}:5000/audio/{secure_filename(audio_filename)}"
-            app.logger.info("Audio URL: %s", audio_url)
-
-        return jsonify({
-            "original_text": extracted,
-            "transliterated_text": transliterated,
-            "detected_script": detected_script,
-            "target_script": target_script,
-            "langCode": f"{tts_lang}",
-            "audio_url": audio_url,
-            "error": ""
-        }), 200
+            with zipfile.ZipFile(io.BytesIO(archive.read())) as zf:
+                total = 0
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    total += info.file_size
+                    if total > BATCH_MAX_ARCHIVE_BYTES:
+                        raise ValueError("Archive too large")
+                    items.append((info.filename, zf.read(info)))
+        except zipfile.BadZipFile:
+            raise ValueError("archive is not a valid zip file")
+    if len(items) > BATCH_MAX_FILES:
+        raise ValueError(f"Too many files (max {BATCH_MAX_FILES})")
+    return items
+
+def _transliterate_batch_item(name: str, file_bytes: bytes, options: dict) -> dict:
+    if not file_bytes:
+        return {"filename": name, "error": "Empty file"}
+    try:
+        ocr = perform_ocr_with_details(file_bytes, ocr_lang=options["ocr_lang"], mode=options["ocr_mode"],
+                                       min_confidence=options["min_confidence"])
+        result = build_transliteration_response(ocr, options["target_scripts"], options["host"],
+                                                with_audio=options["with_audio"], log=False,
+                                                correct=options["correct"], async_audio=options["async_audio"])
+    except Exception as e:
+        result = {"error": str(e)}
+    result["filename"] = name
+    return result
+
+@app.route('/transliterate/batch', methods=['POST'])
+def transliterate_batch():
+    """
+    Many images in one request, as repeated `files` parts or a zip `archive`.
+    Returns {"results": [...]} with one /transliterate-style result per image,
+    in upload order. Audio is only generated with audio=1.
+    """
+    # the body is only parsed on first access to request.files, so these still apply;
+    # the part limit leaves room for the option fields next to BATCH_MAX_FILES files
+    request.max_content_length = BATCH_MAX_UPLOAD_BYTES
+    request.max_form_parts = BATCH_MAX_FILES + 100
+    try:
+        try:
+            items = _read_batch_files()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except HTTPException as e:
+            # body over BATCH_MAX_UPLOAD_BYTES or too many parts: 413, not a server error
+            return jsonify({'error': e.description}), e.code
+        if not items:
+            return jsonify({'error': 'No files uploaded'}), 400
+        try:
+            target_scripts = parse_target_scripts(request.form.getlist('target_script'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        options = {
+            "target_scripts": target_scripts,
+            "ocr_lang": request.form.get('ocr_lang') or DEFAULT_OCR_LANG,
+            "ocr_mode": (request.form.get('ocr_mode') or OCR_MODE).lower(),
+            "min_confidence": request.form.get('min_confidence', type=float),
+            "with_audio": request_flag(request.form.get('audio'), False),
+            "correct": request_flag(request.form.get('correct'), FUZZY_CORRECTION),
+            "async_audio": request_flag(request.form.get('async_audio'), TTS_ASYNC),
+            "host": _public_host(),
+        }
+        start = time.time()
+        results = list(BATCH_EXECUTOR.map(lambda item: _transliterate_batch_item(item[0], item[1], options), items))
+        failed = sum(1 for r in results if r.get("error"))
+        app.logger.info("Batch: %d images in %.2fs (%d without text or failed)",
+                        len(results), time.time() - start, failed)
+        return jsonify({"results": results, "count": len(results), "error": ""}), 200
+
+    except Exception as e:
+        app.logger.exception("Server exception: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+def _transliterate_text_item(original: str, text: str, corrections: list, detected_script: str,
+                             options: dict) -> dict:
+    if not text:
+        return {"original_text": "", "error": "Empty text"}
+    target_scripts = options["target_scripts"]
+    target_script = target_scripts[0]
+    detected_script, transliterations, runs = transliterate_text_targets(text, target_scripts, detected_script)
+    transliterated = transliterations[target_script]
+    tts_text, tts_lang = _tts_request(text, transliterated, detected_script, target_script)
+    audio_filename, audio_pending = "", False
+    if options["with_audio"] and tts_text.strip():
+        audio_filename, audio_pending = _generate_audio(text, tts_text, tts_lang, options["async_audio"])
+    result = {
+        "original_text": original,
+        "transliterated_text": transliterated,
+        "transliterations": transliterations,
+        "detected_script": detected_script,
+        "target_script": target_script,
+        "target_scripts": target_scripts,
+        "langCode": tts_lang,
+        "audio_url": _audio_url(audio_filename, options["host"], log=False),
+        "error": ""
+    }
+    if options["async_audio"]:
+        result["audio_pending"] = audio_pending
+    if options["correct"]:
+        result.update(corrected_text=text, corrections=corrections)
+    if runs:
+        result["runs"] = runs
+    return result
+
+@app.route('/transliterate/text', methods=['POST'])
+def transliterate_texts():
+    """
+    Transliterate text the caller already has, skipping image decoding and OCR.
+    JSON body: {"texts": [...]} (or {"text": "..."}), "target_script" (name,
+    list or "all"),
+    "audio" (default false), "async_audio" (default TTS_ASYNC), "correct"
+    (gazetteer correction, default FUZZY_CORRECTION). Returns
+    {"results": [...]} in input order.
+    """
+    try:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        texts = body.get('texts')
+        if texts is None and 'text' in body:
+            texts = [body['text']]
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': 'No texts given'}), 400
+        if len(texts) > BATCH_MAX_FILES:
+            return jsonify({'error': f'Too many texts (max {BATCH_MAX_FILES})'}), 400
+        try:
+            target_scripts = parse_target_scripts(body.get('target_script'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        options = {
+            "target_scripts": target_scripts,
+            "with_audio": request_flag(body.get('audio'), False),
+            "correct": request_flag(body.get('correct'), FUZZY_CORRECTION),
+            "async_audio": request_flag(body.get('async_audio'), TTS_ASYNC),
+            "host": _public_host(),
+        }
+        originals = [t.strip() if isinstance(t, str) else "" for t in texts]
+        if options["correct"]:
+            texts, corrections = zip(*(correct_ocr_text(t) for t in originals))
+        else:
+            texts, corrections = originals, [[]] * len(originals)
+        items = list(zip(originals, texts, corrections, detect_scripts(list(texts))))
+        if options["with_audio"] and not options["async_audio"]:
+            # TTS is network-bound, so voice the texts concurrently
+            results = list(BATCH_EXECUTOR.map(lambda item: _transliterate_text_item(*item, options), items))
+        else:
+            results = [_transliterate_text_item(*item, options) for item in items]
+        return jsonify({"results": results, "count": len(results), "error": ""}), 200
 
     except Exception as e:
         app.logger.exception("Server exception: %s", e)
@@ -336,20 +2425,99 @@ def transliterate_image():
 @app.route('/audio/<path:filename>')
 def serve_audio(filename):
     try:
-        file_path = os.path.join(AUDIO_FOLDER, secure_filename(filename))
+        filename = secure_filename(filename)
+        # audio still being synthesized (async_audio): wait a while for it
+        status, filename = TTS_JOBS.status(filename, TTS_PENDING_WAIT_SECONDS)
+        if status == "pending":
+            rv = jsonify({"status": "pending", "error": ""})
+            rv.status_code = 202
+            rv.headers['Retry-After'] = str(TTS_RETRY_AFTER_SECONDS)
+            return rv
+        if status == "failed":
+            return jsonify({"error": "Audio synthesis failed"}), 500
+        file_path = os.path.join(AUDIO_FOLDER, filename)
         if not os.path.exists(file_path):
             return jsonify({"error": "Audio file not found"}), 404
         # Support Range requests for streaming
-        return send_file_partial(file_path)
+        return send_file_partial(file_path, audio_mimetype(filename))
     except Exception as e:
         app.logger.exception("serve_audio error: %s", e)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/audio/stream', methods=['GET'])
+def stream_audio():
+    """
+    Pronunciation audio of ?text= in ?lang= (default: from the text's script),
+    sent with chunked transfer encoding as each sentence chunk is synthesized.
+    The complete file is cached for /audio/<file>; its URL is in the
+    Content-Location header.
+    """
+    try:
+        text = normalize_tts_text(request.args.get('text', ''))
+        if not text:
+            return jsonify({"error": "No text given"}), 400
+        lang_code = request.args.get('lang') or TTS_LANG_MAP.get(detect_script(text), "en")
+        configured = [TTS_BACKENDS[n] for n in TTS_LANG_BACKENDS.get(lang_code, TTS_BACKEND_ORDER) if n in TTS_BACKENDS]
+        if not any(b.supports(lang_code) for b in configured):
+            return jsonify({"error": f"Unsupported language: {lang_code}"}), 400
+        candidates = [(b, tts_filename(text, lang_code, b)) for b in tts_backends_for(lang_code)]
+        existing = TTS_AUDIO.lookup([filename for _, filename in candidates])
+        if not existing:
+            streamable = [(b, filename) for b, filename in candidates if b.streamable]
+            if streamable:
+                backend, filename = streamable[0]
+                stream = TTS_STREAMS.open(text, lang_code, backend, filename)
+                # wait for the first chunk, so a synthesis that fails at once is a 500, not an empty 200
+                chunks = stream.read()
+                first = next(chunks, None)
+                if first is None:
+                    return jsonify({"error": "Audio synthesis failed"}), 500
+                rv = Response(itertools.chain([first], chunks), mimetype=backend.mimetype)
+                rv.headers['Content-Location'] = f"/audio/{filename}"
+                return rv
+            # no backend can stream: synthesize the whole file first
+            existing = generate_tts_audio(text, lang_code)
+            if not existing:
+                return jsonify({"error": "Audio synthesis failed"}), 500
+        return send_file_partial(os.path.join(AUDIO_FOLDER, existing), audio_mimetype(existing))
+    except Exception as e:
+        app.logger.exception("stream_audio error: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({
+        "ocr_cache": OCR_CACHE.stats(),
+        "transliteration_memo": transliteration_memo_stats(),
+        "gazetteer": GAZETTEER.stats(),
+        "tts_audio": TTS_AUDIO.stats(),
+    }), 200
+
 @app.route('/', methods=['GET'])
 def home():
     return jsonify({"status": "running", "service": "Indian Script Transliteration API", "version": "1.5"}), 200
 
 
+def warm_ocr_pool():
+    """
+    Probe the installed traineddata and start the OCR pool with it loaded, in
+    the background, so it is ready before the first upload arrives. Nothing is
+    warmed if Tesseract cannot be found.
+    """
+    def warm():
+        if installed_ocr_langs() is None:
+            return
+        OCR_POOL.warm_langs = [resolve_ocr_lang(DEFAULT_OCR_LANG)[0]]
+        OCR_POOL.start(warm=True)
+
+    threading.Thread(target=warm, name="ocr-warm-up", daemon=True).start()
+
+# `python server.py` always runs the debug reloader, whose parent process only
+# watches files; under a WSGI server the module is imported as "server"
+if OCR_POOL_WARM_ON_START and (__name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
+    warm_ocr_pool()
+
+
 if __name__ == '__main__':
     print("🚀 Starting server on 0.0.0.0:5000")
     print(f"📡 Make sure PHONE can access: http://{SERVER_IP}:5000")